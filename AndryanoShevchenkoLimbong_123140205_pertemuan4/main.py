@@ -3,6 +3,19 @@ Program Pengelolaan Data Nilai Mahasiswa
 Dibuat untuk memenuhi tugas praktikum Python
 """
 
+import math
+import sqlite3
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import islice
+
+# Bobot nilai akhir: (UTS, UAS, Tugas)
+BOBOT_NILAI = (0.3, 0.4, 0.3)
+
+# Batas bawah setiap grade, urut dari grade tertinggi. Di bawah batas terakhir = E
+BATAS_GRADE = ((80, "A"), (70, "B"), (60, "C"), (50, "D"))
+GRADE_TERENDAH = "E"
+
 # Data awal mahasiswa
 data_mahasiswa = [
     {
@@ -43,9 +56,9 @@ data_mahasiswa = [
 ]
 
 
-def hitung_nilai_akhir(nilai_uts, nilai_uas, nilai_tugas):
+def hitung_nilai_akhir(nilai_uts, nilai_uas, nilai_tugas, bobot=BOBOT_NILAI):
     """
-    Menghitung nilai akhir berdasarkan bobot:
+    Menghitung nilai akhir berdasarkan bobot (default BOBOT_NILAI):
     - UTS: 30%
     - UAS: 40%
     - Tugas: 30%
@@ -54,17 +67,19 @@ def hitung_nilai_akhir(nilai_uts, nilai_uas, nilai_tugas):
         nilai_uts (float): Nilai UTS
         nilai_uas (float): Nilai UAS
         nilai_tugas (float): Nilai Tugas
+        bobot (tuple): Bobot (UTS, UAS, Tugas)
     
     Returns:
         float: Nilai akhir
     """
-    nilai_akhir = (nilai_uts * 0.3) + (nilai_uas * 0.4) + (nilai_tugas * 0.3)
+    bobot_uts, bobot_uas, bobot_tugas = bobot
+    nilai_akhir = (nilai_uts * bobot_uts) + (nilai_uas * bobot_uas) + (nilai_tugas * bobot_tugas)
     return round(nilai_akhir, 2)
 
 
-def tentukan_grade(nilai_akhir):
+def tentukan_grade(nilai_akhir, batas=BATAS_GRADE):
     """
-    Menentukan grade berdasarkan nilai akhir:
+    Menentukan grade berdasarkan nilai akhir (default BATAS_GRADE):
     - A: >= 80
     - B: >= 70
     - C: >= 60
@@ -73,28 +88,24 @@ def tentukan_grade(nilai_akhir):
     
     Args:
         nilai_akhir (float): Nilai akhir mahasiswa
+        batas (tuple): Pasangan (batas bawah, grade), urut dari grade tertinggi
     
     Returns:
         str: Grade (A/B/C/D/E)
     """
-    if nilai_akhir >= 80:
-        return "A"
-    elif nilai_akhir >= 70:
-        return "B"
-    elif nilai_akhir >= 60:
-        return "C"
-    elif nilai_akhir >= 50:
-        return "D"
-    else:
-        return "E"
+    for batas_bawah, grade in batas:
+        if nilai_akhir >= batas_bawah:
+            return grade
+    return GRADE_TERENDAH
 
 
-def tampilkan_tabel(data):
+def tampilkan_tabel(data, nomor_awal=1):
     """
     Menampilkan data mahasiswa dalam format tabel
     
     Args:
         data (list): List berisi dictionary data mahasiswa
+        nomor_awal (int): Nomor baris pertama (untuk tampilan per halaman)
     """
     if not data:
         print("Tidak ada data untuk ditampilkan.")
@@ -104,7 +115,7 @@ def tampilkan_tabel(data):
     print(f"{'No':<5} {'Nama':<20} {'NIM':<12} {'UTS':<6} {'UAS':<6} {'Tugas':<8} {'Akhir':<8} {'Grade':<6}")
     print("="*100)
     
-    for i, mhs in enumerate(data, 1):
+    for i, mhs in enumerate(data, nomor_awal):
         nilai_akhir = hitung_nilai_akhir(
             mhs['nilai_uts'], 
             mhs['nilai_uas'], 
@@ -118,6 +129,32 @@ def tampilkan_tabel(data):
     print("="*100)
 
 
+def tampilkan_per_halaman(indeks, ukuran_halaman=10, urut="nim"):
+    """
+    Menampilkan data mahasiswa halaman demi halaman.
+    Halaman berikutnya diambil dari IndeksMahasiswa hanya jika diminta,
+    sehingga data yang besar tidak dicetak sekaligus.
+    
+    Args:
+        indeks (IndeksMahasiswa): Indeks data mahasiswa
+        ukuran_halaman (int): Jumlah mahasiswa per halaman
+        urut (str): "nim" atau "nilai" (nilai akhir tertinggi lebih dulu)
+    """
+    if not len(indeks):
+        print("Tidak ada data untuk ditampilkan.")
+        return
+    
+    nomor_awal = 1
+    for halaman, kursor in indeks.iter_halaman(ukuran_halaman, urut):
+        tampilkan_tabel(halaman, nomor_awal)
+        nomor_awal += len(halaman)
+        if kursor is None:
+            break
+        lanjut = input("Tekan Enter untuk halaman berikutnya atau 'q' untuk berhenti: ")
+        if lanjut.strip().lower() == "q":
+            break
+
+
 def cari_nilai_tertinggi(data):
     """
     Mencari mahasiswa dengan nilai akhir tertinggi
@@ -184,10 +221,13 @@ def cari_nilai_terendah(data):
     return mhs_terendah, nilai_terendah
 
 
-def input_mahasiswa_baru():
+def input_mahasiswa_baru(indeks=None):
     """
     Menginput data mahasiswa baru
     
+    Args:
+        indeks (IndeksMahasiswa): Indeks untuk mengecek NIM yang sudah terdaftar
+    
     Returns:
         dict: Dictionary berisi data mahasiswa baru
     """
@@ -196,6 +236,10 @@ def input_mahasiswa_baru():
     nama = input("Nama Mahasiswa: ").strip()
     nim = input("NIM: ").strip()
     
+    if indeks is not None and nim in indeks:
+        print(f"Error: NIM {nim} sudah terdaftar!")
+        return None
+    
     try:
         nilai_uts = float(input("Nilai UTS (0-100): "))
         nilai_uas = float(input("Nilai UAS (0-100): "))
@@ -273,10 +317,1107 @@ def hitung_rata_rata_kelas(data):
     return round(total_nilai / len(data), 2)
 
 
+def angkatan_dari_nim(mhs):
+    """
+    Mengambil angkatan dari 4 digit pertama NIM (contoh: "2301001" -> "2301")
+    
+    Args:
+        mhs (dict): Data mahasiswa
+    
+    Returns:
+        str: Kode angkatan
+    """
+    return mhs['nim'][:4]
+
+
+def hitung_statistik_per_kelompok(data, kunci_kelompok=angkatan_dari_nim):
+    """
+    Menghitung statistik nilai per kelompok (kelas/angkatan) dalam satu kali
+    iterasi data menggunakan hash aggregation (dictionary per kelompok).
+    
+    Args:
+        data (list): List berisi dictionary data mahasiswa
+        kunci_kelompok (callable): Fungsi mhs -> kunci kelompok,
+            default angkatan dari prefix NIM
+    
+    Returns:
+        dict: Kunci kelompok -> dictionary berisi:
+            - jumlah (int): Jumlah mahasiswa
+            - rata_rata (float): Rata-rata nilai akhir
+            - tertinggi (tuple): (data mahasiswa, nilai akhir) tertinggi
+            - terendah (tuple): (data mahasiswa, nilai akhir) terendah
+            - distribusi_grade (dict): Grade -> jumlah mahasiswa
+    """
+    kelompok = {}
+    
+    for mhs in data:
+        nilai_akhir = hitung_nilai_akhir(
+            mhs['nilai_uts'],
+            mhs['nilai_uas'],
+            mhs['nilai_tugas']
+        )
+        grade = tentukan_grade(nilai_akhir)
+        kunci = kunci_kelompok(mhs)
+        
+        statistik = kelompok.get(kunci)
+        if statistik is None:
+            statistik = {
+                "jumlah": 0,
+                "total": 0,
+                "tertinggi": (mhs, nilai_akhir),
+                "terendah": (mhs, nilai_akhir),
+                "distribusi_grade": {g: 0 for g in "ABCDE"}
+            }
+            kelompok[kunci] = statistik
+        
+        statistik["jumlah"] += 1
+        statistik["total"] += nilai_akhir
+        statistik["distribusi_grade"][grade] += 1
+        if nilai_akhir > statistik["tertinggi"][1]:
+            statistik["tertinggi"] = (mhs, nilai_akhir)
+        if nilai_akhir < statistik["terendah"][1]:
+            statistik["terendah"] = (mhs, nilai_akhir)
+    
+    for statistik in kelompok.values():
+        statistik["rata_rata"] = round(statistik.pop("total") / statistik["jumlah"], 2)
+    
+    return kelompok
+
+
+def tampilkan_statistik_kelompok(hasil):
+    """
+    Menampilkan hasil hitung_statistik_per_kelompok dalam format tabel
+    
+    Args:
+        hasil (dict): Hasil dari hitung_statistik_per_kelompok
+    """
+    if not hasil:
+        print("Tidak ada data untuk ditampilkan.")
+        return
+    
+    print("\n" + "="*80)
+    print(f"{'Kelompok':<12} {'Jumlah':<8} {'Rata2':<8} {'Max':<8} {'Min':<8} "
+          f"{'A':<5} {'B':<5} {'C':<5} {'D':<5} {'E':<5}")
+    print("="*80)
+    
+    for kunci in sorted(hasil):
+        statistik = hasil[kunci]
+        distribusi = statistik["distribusi_grade"]
+        print(f"{kunci:<12} {statistik['jumlah']:<8} {statistik['rata_rata']:<8} "
+              f"{statistik['tertinggi'][1]:<8} {statistik['terendah'][1]:<8} "
+              f"{distribusi['A']:<5} {distribusi['B']:<5} {distribusi['C']:<5} "
+              f"{distribusi['D']:<5} {distribusi['E']:<5}")
+    
+    print("="*80)
+
+
+class HistogramNilai:
+    """
+    Sketsa distribusi nilai akhir untuk data streaming.
+    Nilai dikelompokkan ke bin dengan lebar tetap pada rentang 0-100, sehingga
+    memori yang dipakai konstan berapa pun jumlah nilai yang masuk.
+    Dua histogram dengan lebar bin yang sama bisa digabung (misalnya dari
+    shard yang berbeda) tanpa kehilangan akurasi.
+    
+    Estimasi persentil memiliki galat maksimum setengah lebar bin
+    dibandingkan persentil eksak (metode nearest-rank).
+    
+    Attributes:
+        lebar_bin (float): Lebar setiap bin
+        _bin (list): Jumlah nilai pada tiap bin
+        _jumlah (int): Total nilai yang sudah masuk
+        _total (float): Penjumlahan seluruh nilai (untuk rata-rata eksak)
+    """
+    
+    NILAI_MAKS = 100
+    
+    def __init__(self, lebar_bin=0.5):
+        """
+        Membuat histogram kosong
+        
+        Args:
+            lebar_bin (float): Lebar bin, semakin kecil semakin akurat
+        """
+        if lebar_bin <= 0:
+            raise ValueError("Lebar bin harus lebih dari 0")
+        self.lebar_bin = lebar_bin
+        self._bin = [0] * math.ceil(self.NILAI_MAKS / lebar_bin)
+        self._jumlah = 0
+        self._total = 0.0
+    
+    @property
+    def jumlah(self):
+        """Jumlah nilai yang sudah masuk"""
+        return self._jumlah
+    
+    @property
+    def galat_maksimum(self):
+        """Batas galat estimasi persentil"""
+        return self.lebar_bin / 2
+    
+    def tambah(self, nilai_akhir, banyak=1):
+        """
+        Memasukkan nilai akhir ke histogram
+        
+        Args:
+            nilai_akhir (float): Nilai akhir (0-100)
+            banyak (int): Berapa kali nilai tersebut dimasukkan
+        """
+        if not 0 <= nilai_akhir <= self.NILAI_MAKS:
+            raise ValueError("Nilai harus antara 0-100!")
+        # Epsilon kecil agar nilai tepat di batas bin tidak jatuh ke bin sebelumnya
+        indeks = min(int(nilai_akhir / self.lebar_bin + 1e-9), len(self._bin) - 1)
+        self._bin[indeks] += banyak
+        self._jumlah += banyak
+        self._total += nilai_akhir * banyak
+    
+    def tambah_mahasiswa(self, mhs):
+        """
+        Menghitung nilai akhir mahasiswa lalu memasukkannya ke histogram
+        
+        Args:
+            mhs (dict): Data mahasiswa
+        """
+        self.tambah(hitung_nilai_akhir(
+            mhs['nilai_uts'],
+            mhs['nilai_uas'],
+            mhs['nilai_tugas']
+        ))
+    
+    def gabung(self, lainnya):
+        """
+        Menggabungkan histogram lain ke histogram ini
+        
+        Args:
+            lainnya (HistogramNilai): Histogram dengan lebar bin yang sama
+        
+        Returns:
+            HistogramNilai: Histogram ini (setelah digabung)
+        """
+        if lainnya.lebar_bin != self.lebar_bin:
+            raise ValueError("Histogram hanya bisa digabung jika lebar bin sama")
+        for i, banyak in enumerate(lainnya._bin):
+            self._bin[i] += banyak
+        self._jumlah += lainnya._jumlah
+        self._total += lainnya._total
+        return self
+    
+    def persentil(self, p):
+        """
+        Estimasi persentil ke-p dari nilai akhir
+        
+        Args:
+            p (float): Persentil (0-100), contoh 50 untuk median
+        
+        Returns:
+            float: Estimasi nilai (titik tengah bin), None jika histogram kosong
+        """
+        if not 0 <= p <= 100:
+            raise ValueError("Persentil harus antara 0-100!")
+        if self._jumlah == 0:
+            return None
+        
+        peringkat = max(1, math.ceil(p / 100 * self._jumlah))
+        kumulatif = 0
+        for i, banyak in enumerate(self._bin):
+            kumulatif += banyak
+            if kumulatif >= peringkat:
+                break
+        
+        titik_tengah = (i + 0.5) * self.lebar_bin
+        return round(min(titik_tengah, self.NILAI_MAKS), 6)
+    
+    def median(self):
+        """
+        Estimasi median nilai akhir
+        
+        Returns:
+            float: Estimasi median, None jika histogram kosong
+        """
+        return self.persentil(50)
+    
+    def rata_rata(self):
+        """
+        Rata-rata eksak nilai akhir
+        
+        Returns:
+            float: Rata-rata nilai, 0 jika histogram kosong
+        """
+        if self._jumlah == 0:
+            return 0
+        return round(self._total / self._jumlah, 2)
+
+
+class DaftarTerurut:
+    """
+    List kunci terurut yang dipecah menjadi beberapa ember (bucket) kecil.
+    Ember dicari dengan binary search pada kunci terbesar tiap ember, lalu
+    kunci disisipkan/dihapus hanya di dalam ember tersebut, sehingga tambah
+    dan hapus tidak perlu menggeser seluruh list (O(log n + UKURAN_EMBER)).
+    Ember yang terlalu besar dibelah dua, ember kosong dibuang.
+    
+    Attributes:
+        _ember (list): List ember, setiap ember berupa list kunci terurut
+        _maks (list): Kunci terbesar dari tiap ember (untuk binary search)
+        _jumlah (int): Total kunci
+    """
+    
+    UKURAN_EMBER = 1000
+    
+    def __init__(self, kunci=()):
+        """
+        Membuat daftar terurut, opsional langsung dari kumpulan kunci
+        
+        Args:
+            kunci (iterable): Kunci awal (tidak harus terurut)
+        """
+        kunci = sorted(kunci)
+        self._ember = [kunci[i:i + self.UKURAN_EMBER]
+                       for i in range(0, len(kunci), self.UKURAN_EMBER)]
+        self._maks = [ember[-1] for ember in self._ember]
+        self._jumlah = len(kunci)
+    
+    def __len__(self):
+        return self._jumlah
+    
+    def tambah(self, kunci):
+        """
+        Menyisipkan kunci sesuai urutan
+        
+        Args:
+            kunci: Kunci yang disisipkan
+        """
+        if not self._ember:
+            self._ember.append([kunci])
+            self._maks.append(kunci)
+            self._jumlah = 1
+            return
+        
+        i = min(bisect_left(self._maks, kunci), len(self._ember) - 1)
+        ember = self._ember[i]
+        ember.insert(bisect_right(ember, kunci), kunci)
+        self._maks[i] = ember[-1]
+        self._jumlah += 1
+        
+        if len(ember) > 2 * self.UKURAN_EMBER:
+            self._ember[i:i + 1] = [ember[:self.UKURAN_EMBER], ember[self.UKURAN_EMBER:]]
+            self._maks[i:i + 1] = [ember[self.UKURAN_EMBER - 1], ember[-1]]
+    
+    def hapus(self, kunci):
+        """
+        Menghapus satu kunci
+        
+        Args:
+            kunci: Kunci yang dihapus
+        
+        Returns:
+            bool: True jika kunci ditemukan dan dihapus
+        """
+        i = bisect_left(self._maks, kunci)
+        if i == len(self._ember):
+            return False
+        ember = self._ember[i]
+        posisi = bisect_left(ember, kunci)
+        if ember[posisi] != kunci:
+            return False
+        
+        del ember[posisi]
+        self._jumlah -= 1
+        if ember:
+            self._maks[i] = ember[-1]
+        else:
+            del self._ember[i]
+            del self._maks[i]
+        return True
+    
+    def setelah(self, kunci, banyak):
+        """
+        Mengambil kunci-kunci berikutnya yang lebih besar dari kunci tertentu
+        
+        Args:
+            kunci: Batas bawah (tidak ikut diambil), None untuk mulai dari awal
+            banyak (int): Jumlah kunci maksimum
+        
+        Returns:
+            list: Kunci terurut
+        """
+        if kunci is None:
+            i, posisi = 0, 0
+        else:
+            i = bisect_right(self._maks, kunci)
+            if i == len(self._ember):
+                return []
+            posisi = bisect_right(self._ember[i], kunci)
+        
+        hasil = []
+        while i < len(self._ember) and len(hasil) < banyak:
+            hasil.extend(self._ember[i][posisi:posisi + banyak - len(hasil)])
+            i, posisi = i + 1, 0
+        return hasil
+
+
+class IndeksMahasiswa:
+    """
+    Indeks data mahasiswa berdasarkan NIM.
+    Lookup, update, dan hapus berjalan O(1) menggunakan dictionary,
+    NIM duplikat ditolak, dan nilai akhir tiap mahasiswa disimpan (cache)
+    serta diperbarui otomatis ketika nilai diubah melalui indeks.
+    
+    Indeks juga menyimpan urutan NIM dan urutan nilai akhir (DaftarTerurut),
+    sehingga data bisa dibaca per halaman dengan kursor (keyset pagination):
+    awal halaman dicari dengan binary search tanpa memindai halaman sebelumnya.
+    Kedua urutan diperbarui setiap kali data berubah dengan biaya
+    O(log n + UKURAN_EMBER), jadi tidak pernah perlu diurutkan ulang.
+    
+    Attributes:
+        _data (dict): NIM -> dictionary data mahasiswa (urut sesuai penambahan)
+        _nilai_akhir (dict): NIM -> nilai akhir yang sudah dihitung
+        _urutan (dict): "nim" -> DaftarTerurut berisi NIM,
+            "nilai" -> DaftarTerurut berisi (-nilai akhir, NIM) (nilai tertinggi lebih dulu)
+    """
+    
+    KOLOM_NILAI = ("nilai_uts", "nilai_uas", "nilai_tugas")
+    URUTAN = ("nim", "nilai")
+    
+    def __init__(self, data=None):
+        """
+        Membuat indeks, opsional langsung memuat data awal
+        
+        Args:
+            data (list): List berisi dictionary data mahasiswa
+        """
+        self._data = {}
+        self._nilai_akhir = {}
+        self._urutan = {"nim": DaftarTerurut(), "nilai": DaftarTerurut()}
+        if data:
+            self.muat(data)
+    
+    def __len__(self):
+        return len(self._data)
+    
+    def __contains__(self, nim):
+        return nim in self._data
+    
+    def _simpan(self, mhs):
+        """
+        Menyimpan mahasiswa ke indeks, menghitung nilai akhirnya, dan
+        memperbarui urutan (urutan NIM hanya berubah untuk NIM baru)
+        
+        Args:
+            mhs (dict): Data mahasiswa
+        """
+        nim = mhs['nim']
+        nilai_baru = hitung_nilai_akhir(
+            mhs['nilai_uts'],
+            mhs['nilai_uas'],
+            mhs['nilai_tugas']
+        )
+        nilai_lama = self._nilai_akhir.get(nim)
+        if nilai_lama is None:
+            self._urutan["nim"].tambah(nim)
+        elif nilai_lama != nilai_baru:
+            self._urutan["nilai"].hapus((-nilai_lama, nim))
+        if nilai_lama != nilai_baru:
+            self._urutan["nilai"].tambah((-nilai_baru, nim))
+        
+        self._data[nim] = mhs
+        self._nilai_akhir[nim] = nilai_baru
+    
+    def tambah(self, mhs):
+        """
+        Menambahkan satu mahasiswa
+        
+        Args:
+            mhs (dict): Data mahasiswa
+        
+        Returns:
+            bool: True jika berhasil, False jika NIM sudah terdaftar
+        """
+        if mhs['nim'] in self._data:
+            return False
+        self._simpan(mhs)
+        return True
+    
+    def muat(self, data):
+        """
+        Memuat banyak mahasiswa sekaligus.
+        Jika ada NIM duplikat (di dalam data atau dengan indeks), tidak ada
+        data yang dimuat sama sekali.
+        
+        Args:
+            data (list): List berisi dictionary data mahasiswa
+        
+        Raises:
+            ValueError: Jika terdapat NIM duplikat
+        """
+        data = list(data)
+        nim_baru = set()
+        duplikat = []
+        for mhs in data:
+            nim = mhs['nim']
+            if nim in self._data or nim in nim_baru:
+                duplikat.append(nim)
+            nim_baru.add(nim)
+        
+        if duplikat:
+            raise ValueError(f"NIM duplikat: {', '.join(duplikat)}")
+        
+        if len(data) < len(self._data):
+            for mhs in data:
+                self._simpan(mhs)
+            return
+        
+        # Batch besar: lebih cepat mengurutkan ulang sekali daripada menyisipkan satu per satu
+        for mhs in data:
+            self._data[mhs['nim']] = mhs
+            self._nilai_akhir[mhs['nim']] = hitung_nilai_akhir(
+                mhs['nilai_uts'],
+                mhs['nilai_uas'],
+                mhs['nilai_tugas']
+            )
+        self._urutan = {
+            "nim": DaftarTerurut(self._data),
+            "nilai": DaftarTerurut((-nilai, nim) for nim, nilai in self._nilai_akhir.items())
+        }
+    
+    def cari(self, nim):
+        """
+        Mencari mahasiswa berdasarkan NIM
+        
+        Args:
+            nim (str): NIM mahasiswa
+        
+        Returns:
+            dict: Data mahasiswa atau None jika tidak ditemukan
+        """
+        return self._data.get(nim)
+    
+    def nilai_akhir(self, nim):
+        """
+        Mengambil nilai akhir mahasiswa dari cache
+        
+        Args:
+            nim (str): NIM mahasiswa
+        
+        Returns:
+            float: Nilai akhir atau None jika NIM tidak ditemukan
+        """
+        return self._nilai_akhir.get(nim)
+    
+    def perbarui_nilai(self, nim, **nilai):
+        """
+        Mengubah nilai UTS/UAS/Tugas mahasiswa dan memperbarui cache nilai akhir
+        
+        Args:
+            nim (str): NIM mahasiswa
+            **nilai: nilai_uts, nilai_uas, dan/atau nilai_tugas yang baru
+        
+        Returns:
+            bool: True jika berhasil, False jika NIM tidak ditemukan
+        
+        Raises:
+            ValueError: Jika nama kolom tidak dikenal atau nilai di luar 0-100
+        """
+        mhs = self._data.get(nim)
+        if mhs is None:
+            return False
+        
+        self._periksa_nilai(nilai)
+        mhs.update(nilai)
+        self._simpan(mhs)
+        return True
+    
+    def _periksa_nilai(self, nilai):
+        """
+        Memeriksa kolom dan rentang nilai sebelum data diubah
+        
+        Args:
+            nilai (dict): Kolom nilai -> angka baru
+        
+        Raises:
+            ValueError: Jika nama kolom tidak dikenal atau nilai di luar 0-100
+        """
+        for kolom, angka in nilai.items():
+            if kolom not in self.KOLOM_NILAI:
+                raise ValueError(f"Kolom nilai tidak dikenal: {kolom}")
+            if not 0 <= angka <= 100:
+                raise ValueError("Nilai harus antara 0-100!")
+    
+    def hapus(self, nim):
+        """
+        Menghapus mahasiswa dari indeks
+        
+        Args:
+            nim (str): NIM mahasiswa
+        
+        Returns:
+            dict: Data mahasiswa yang dihapus atau None jika tidak ditemukan
+        """
+        if nim not in self._data:
+            return None
+        self._urutan["nim"].hapus(nim)
+        self._urutan["nilai"].hapus((-self._nilai_akhir.pop(nim), nim))
+        return self._data.pop(nim)
+    
+    def gabung_koreksi(self, *daftar_koreksi):
+        """
+        Menerapkan koreksi nilai dari satu atau beberapa penilai.
+        Setiap koreksi berupa dictionary berisi 'nim' dan kolom nilai yang
+        diubah. Koreksi diproses berurutan, sehingga koreksi terakhir yang menang.
+        Semua koreksi diperiksa lebih dulu; jika ada yang tidak valid, tidak ada
+        koreksi yang diterapkan sama sekali.
+        
+        Args:
+            *daftar_koreksi (list): List koreksi dari masing-masing penilai
+        
+        Returns:
+            list: NIM yang tidak ditemukan di indeks
+        
+        Raises:
+            ValueError: Jika ada koreksi dengan kolom tidak dikenal atau nilai di luar 0-100
+        """
+        semua_koreksi = []
+        tidak_valid = []
+        for koreksi_penilai in daftar_koreksi:
+            for koreksi in koreksi_penilai:
+                nilai = {k: v for k, v in koreksi.items() if k != 'nim'}
+                try:
+                    self._periksa_nilai(nilai)
+                except ValueError as error:
+                    tidak_valid.append(f"{koreksi['nim']} ({error})")
+                semua_koreksi.append((koreksi['nim'], nilai))
+        
+        if tidak_valid:
+            raise ValueError(f"Koreksi tidak valid: {'; '.join(tidak_valid)}")
+        
+        tidak_ditemukan = []
+        for nim, nilai in semua_koreksi:
+            if not self.perbarui_nilai(nim, **nilai):
+                tidak_ditemukan.append(nim)
+        return tidak_ditemukan
+    
+    def daftar(self):
+        """
+        Mengambil seluruh data mahasiswa sesuai urutan penambahan
+        
+        Returns:
+            list: List berisi dictionary data mahasiswa
+        """
+        return list(self._data.values())
+    
+    def halaman(self, ukuran=10, urut="nim", setelah=None):
+        """
+        Mengambil satu halaman data mahasiswa (keyset pagination)
+        
+        Args:
+            ukuran (int): Jumlah mahasiswa per halaman
+            urut (str): "nim" (menaik) atau "nilai" (nilai akhir tertinggi lebih dulu)
+            setelah: Kursor dari halaman sebelumnya, None untuk halaman pertama
+        
+        Returns:
+            tuple: (list data mahasiswa, kursor halaman berikutnya atau None
+                jika ini halaman terakhir)
+        
+        Raises:
+            ValueError: Jika ukuran bukan bilangan positif atau urutan tidak dikenal
+        """
+        if ukuran <= 0:
+            raise ValueError("Ukuran halaman harus lebih dari 0")
+        if urut not in self.URUTAN:
+            raise ValueError(f"Urutan tidak dikenal: {urut}")
+        
+        # Satu kunci tambahan untuk mengetahui apakah masih ada halaman berikutnya
+        potongan = self._urutan[urut].setelah(setelah, ukuran + 1)
+        kursor = None
+        if len(potongan) > ukuran:
+            potongan = potongan[:ukuran]
+            kursor = potongan[-1]
+        if urut == "nilai":
+            return [self._data[nim] for _, nim in potongan], kursor
+        return [self._data[nim] for nim in potongan], kursor
+    
+    def iter_halaman(self, ukuran=10, urut="nim", setelah=None):
+        """
+        Generator halaman data mahasiswa; halaman berikutnya baru diambil
+        ketika diminta
+        
+        Args:
+            ukuran (int): Jumlah mahasiswa per halaman
+            urut (str): "nim" atau "nilai"
+            setelah: Kursor awal, None untuk mulai dari halaman pertama
+        
+        Yields:
+            tuple: (list data mahasiswa, kursor halaman berikutnya atau None)
+        """
+        while True:
+            halaman, setelah = self.halaman(ukuran, urut, setelah)
+            if halaman:
+                yield halaman, setelah
+            if setelah is None:
+                return
+
+
+class SimulasiPenilaian:
+    """
+    Simulasi penilaian ulang (what-if) ketika bobot nilai atau batas grade diubah.
+    Nilai UTS, UAS, dan Tugas disimpan per kolom (array), sehingga perubahan
+    bobot dihitung ulang untuk seluruh data dalam satu kali lintasan. Jika
+    hanya batas grade yang berubah, nilai akhir tidak dihitung ulang dan hanya
+    mahasiswa dengan nilai di antara batas lama dan batas baru yang diperiksa
+    (dicari dengan binary search pada nilai akhir yang sudah terurut).
+    
+    Hasil simulasi hanya berisi mahasiswa yang grade-nya berubah beserta
+    distribusi grade yang baru.
+    
+    Attributes:
+        bobot (tuple): Bobot yang sedang berlaku (UTS, UAS, Tugas)
+        batas (tuple): Batas grade yang sedang berlaku
+        _nim (list): NIM setiap baris
+        _uts, _uas, _tugas (array): Kolom nilai UTS, UAS, dan Tugas
+        _nilai_akhir (array): Nilai akhir setiap baris dengan bobot yang berlaku
+        _grade (list): Grade setiap baris dengan batas yang berlaku
+        _distribusi (dict): Grade -> jumlah mahasiswa
+        _urutan (list): Indeks baris terurut berdasarkan nilai akhir (dibuat saat dibutuhkan)
+        _nilai_urut (array): Nilai akhir sesuai _urutan
+    """
+    
+    def __init__(self, data, bobot=BOBOT_NILAI, batas=BATAS_GRADE):
+        """
+        Memuat data mahasiswa ke kolom-kolom nilai
+        
+        Args:
+            data (iterable): Dictionary data mahasiswa
+            bobot (tuple): Bobot awal (UTS, UAS, Tugas)
+            batas (tuple): Batas grade awal, pasangan (batas bawah, grade)
+        """
+        self.bobot = self._validasi_bobot(bobot)
+        self.batas = self._validasi_batas(batas)
+        self._nim = []
+        self._uts = array('d')
+        self._uas = array('d')
+        self._tugas = array('d')
+        for mhs in data:
+            self._nim.append(mhs['nim'])
+            self._uts.append(mhs['nilai_uts'])
+            self._uas.append(mhs['nilai_uas'])
+            self._tugas.append(mhs['nilai_tugas'])
+        
+        self._nilai_akhir = self._hitung_nilai_akhir(self.bobot)
+        beri_grade = self._pemberi_grade(self.batas)
+        self._grade = [beri_grade(nilai) for nilai in self._nilai_akhir]
+        self._distribusi = self._hitung_distribusi(self._grade, self.batas)
+        self._urutan = None
+        self._nilai_urut = None
+    
+    def __len__(self):
+        return len(self._nim)
+    
+    @property
+    def distribusi(self):
+        """Distribusi grade dengan bobot dan batas yang berlaku"""
+        return dict(self._distribusi)
+    
+    @staticmethod
+    def _validasi_bobot(bobot):
+        """Memastikan bobot berisi tiga angka non-negatif"""
+        bobot = tuple(bobot)
+        if len(bobot) != 3 or any(b < 0 for b in bobot):
+            raise ValueError("Bobot harus berisi tiga angka non-negatif (UTS, UAS, Tugas)")
+        return bobot
+    
+    @staticmethod
+    def _validasi_batas(batas):
+        """Memastikan batas grade urut menurun dan tidak ada grade ganda"""
+        batas = tuple((batas_bawah, grade) for batas_bawah, grade in batas)
+        nilai_batas = [batas_bawah for batas_bawah, _ in batas]
+        grade = [g for _, g in batas] + [GRADE_TERENDAH]
+        if any(a <= b for a, b in zip(nilai_batas, nilai_batas[1:])):
+            raise ValueError("Batas grade harus urut menurun!")
+        if len(set(grade)) != len(grade):
+            raise ValueError("Setiap grade hanya boleh punya satu batas!")
+        return batas
+    
+    @staticmethod
+    def _pemberi_grade(batas):
+        """
+        Membuat fungsi nilai -> grade berbasis binary search, hasilnya sama
+        dengan tentukan_grade(nilai, batas)
+        """
+        nilai_batas = [batas_bawah for batas_bawah, _ in reversed(batas)]
+        grade = [GRADE_TERENDAH] + [g for _, g in reversed(batas)]
+        return lambda nilai: grade[bisect_right(nilai_batas, nilai)]
+    
+    @staticmethod
+    def _hitung_distribusi(daftar_grade, batas):
+        """Menghitung jumlah mahasiswa per grade"""
+        distribusi = {grade: 0 for _, grade in batas}
+        distribusi[GRADE_TERENDAH] = 0
+        for grade in daftar_grade:
+            distribusi[grade] += 1
+        return distribusi
+    
+    def _hitung_nilai_akhir(self, bobot):
+        """Menghitung nilai akhir seluruh baris sekaligus dengan bobot tertentu"""
+        bobot_uts, bobot_uas, bobot_tugas = bobot
+        return array('d', [
+            round((uts * bobot_uts) + (uas * bobot_uas) + (tugas * bobot_tugas), 2)
+            for uts, uas, tugas in zip(self._uts, self._uas, self._tugas)
+        ])
+    
+    def _baris_terurut(self):
+        """Indeks baris dan nilai akhir terurut menaik (dibuat sekali per bobot)"""
+        if self._urutan is None:
+            nilai_akhir = self._nilai_akhir
+            self._urutan = sorted(range(len(nilai_akhir)), key=nilai_akhir.__getitem__)
+            self._nilai_urut = array('d', (nilai_akhir[i] for i in self._urutan))
+        return self._urutan, self._nilai_urut
+    
+    def _baris_terdampak(self, batas_baru):
+        """
+        Mencari baris yang grade-nya mungkin berubah jika hanya batas yang
+        digeser: nilai akhir di antara batas lama dan batas baru
+        
+        Returns:
+            iterable: Indeks baris, None jika susunan grade ikut berubah
+        """
+        if [g for _, g in self.batas] != [g for _, g in batas_baru]:
+            return None
+        
+        urutan, nilai_urut = self._baris_terurut()
+        terdampak = set()
+        for (lama, _), (baru, _) in zip(self.batas, batas_baru):
+            if lama == baru:
+                continue
+            awal = bisect_left(nilai_urut, min(lama, baru))
+            akhir = bisect_left(nilai_urut, max(lama, baru))
+            terdampak.update(urutan[awal:akhir])
+        return sorted(terdampak)
+    
+    def _simulasi(self, bobot, batas, terapkan):
+        """Inti pratinjau() dan terapkan()"""
+        bobot = self.bobot if bobot is None else self._validasi_bobot(bobot)
+        batas = self.batas if batas is None else self._validasi_batas(batas)
+        beri_grade = self._pemberi_grade(batas)
+        nilai_lama = self._nilai_akhir
+        grade_lama = self._grade
+        
+        if bobot != self.bobot:
+            nilai_baru = self._hitung_nilai_akhir(bobot)
+            baris = None
+        else:
+            nilai_baru = nilai_lama
+            baris = self._baris_terdampak(batas) if batas != self.batas else []
+        
+        # baris None berarti seluruh data dinilai ulang
+        if baris is None:
+            grade_baru = [beri_grade(nilai) for nilai in nilai_baru]
+            berubah = [i for i, (lama, baru) in enumerate(zip(grade_lama, grade_baru)) if lama != baru]
+            distribusi = self._hitung_distribusi(grade_baru, batas)
+        else:
+            grade_baru = {}
+            berubah = []
+            distribusi = dict(self._distribusi)
+            for i in baris:
+                grade = beri_grade(nilai_baru[i])
+                if grade != grade_lama[i]:
+                    grade_baru[i] = grade
+                    berubah.append(i)
+                    distribusi[grade_lama[i]] -= 1
+                    distribusi[grade] += 1
+        
+        perubahan = [
+            (self._nim[i], grade_lama[i], grade_baru[i], nilai_lama[i], nilai_baru[i])
+            for i in berubah
+        ]
+        
+        if terapkan:
+            if nilai_baru is not nilai_lama:
+                self._nilai_akhir = nilai_baru
+                self._urutan = None
+                self._nilai_urut = None
+            if isinstance(grade_baru, list):
+                self._grade = grade_baru
+            else:
+                for i, grade in grade_baru.items():
+                    self._grade[i] = grade
+            self.bobot = bobot
+            self.batas = batas
+            self._distribusi = distribusi
+        
+        return {"perubahan": perubahan, "distribusi": dict(distribusi)}
+    
+    def pratinjau(self, bobot=None, batas=None):
+        """
+        Melihat dampak bobot dan/atau batas grade baru tanpa mengubah
+        kebijakan yang berlaku
+        
+        Args:
+            bobot (tuple): Bobot baru (UTS, UAS, Tugas), None = tidak berubah
+            batas (tuple): Batas grade baru, None = tidak berubah
+        
+        Returns:
+            dict: Berisi:
+                - perubahan (list): Tuple (nim, grade lama, grade baru,
+                  nilai akhir lama, nilai akhir baru) untuk mahasiswa yang
+                  grade-nya berubah
+                - distribusi (dict): Grade -> jumlah mahasiswa setelah perubahan
+        """
+        return self._simulasi(bobot, batas, terapkan=False)
+    
+    def terapkan(self, bobot=None, batas=None):
+        """
+        Sama seperti pratinjau(), tetapi bobot dan batas baru langsung
+        menjadi kebijakan yang berlaku untuk simulasi berikutnya
+        
+        Returns:
+            dict: Sama seperti pratinjau()
+        """
+        return self._simulasi(bobot, batas, terapkan=True)
+
+
+def tampilkan_hasil_simulasi(hasil, maks_baris=20):
+    """
+    Menampilkan hasil SimulasiPenilaian.pratinjau() / terapkan()
+    
+    Args:
+        hasil (dict): Hasil simulasi
+        maks_baris (int): Jumlah maksimum perubahan yang dicetak
+    """
+    perubahan = hasil["perubahan"]
+    print("\n" + "="*70)
+    print(f"{'NIM':<15} {'Nilai Lama':<12} {'Nilai Baru':<12} {'Grade Lama':<12} {'Grade Baru':<12}")
+    print("="*70)
+    for nim, grade_lama, grade_baru, nilai_lama, nilai_baru in perubahan[:maks_baris]:
+        print(f"{nim:<15} {nilai_lama:<12} {nilai_baru:<12} {grade_lama:<12} {grade_baru:<12}")
+    if len(perubahan) > maks_baris:
+        print(f"... dan {len(perubahan) - maks_baris} perubahan lainnya")
+    print("="*70)
+    print(f"Total grade berubah: {len(perubahan)}")
+    print("Distribusi grade: " + ", ".join(f"{g}={n}" for g, n in hasil["distribusi"].items()))
+
+
+# Penyimpanan permanen data mahasiswa menggunakan SQLite
+SQL_UPSERT_MAHASISWA = """
+    INSERT INTO mahasiswa (nim, nama, nilai_uts, nilai_uas, nilai_tugas, nilai_akhir, grade)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(nim) DO UPDATE SET
+        nama = excluded.nama,
+        nilai_uts = excluded.nilai_uts,
+        nilai_uas = excluded.nilai_uas,
+        nilai_tugas = excluded.nilai_tugas,
+        nilai_akhir = excluded.nilai_akhir,
+        grade = excluded.grade
+"""
+
+
+def buka_database(path="nilai_mahasiswa.db"):
+    """
+    Membuka (dan membuat jika belum ada) database nilai mahasiswa.
+    NIM menjadi primary key, nilai akhir dan grade disimpan sebagai kolom
+    ber-index agar filter dan pencarian tidak perlu menghitung ulang.
+    
+    Args:
+        path (str): Lokasi file database
+    
+    Returns:
+        sqlite3.Connection: Koneksi database
+    """
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    with conn:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS mahasiswa (
+                nim TEXT PRIMARY KEY,
+                nama TEXT NOT NULL,
+                nilai_uts REAL NOT NULL,
+                nilai_uas REAL NOT NULL,
+                nilai_tugas REAL NOT NULL,
+                nilai_akhir REAL NOT NULL,
+                grade TEXT NOT NULL
+            ) WITHOUT ROWID
+        """)
+        _buat_index(conn)
+    return conn
+
+
+def _buat_index(conn):
+    """
+    Membuat index untuk kolom nilai akhir dan grade
+    
+    Args:
+        conn (sqlite3.Connection): Koneksi database
+    """
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_mahasiswa_akhir ON mahasiswa(nilai_akhir)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_mahasiswa_grade ON mahasiswa(grade)")
+
+
+def _baris_mahasiswa(mhs):
+    """
+    Mengubah dictionary mahasiswa menjadi tuple untuk query upsert
+    
+    Args:
+        mhs (dict): Data mahasiswa
+    
+    Returns:
+        tuple: Nilai kolom sesuai urutan SQL_UPSERT_MAHASISWA
+    """
+    nilai_akhir = hitung_nilai_akhir(mhs['nilai_uts'], mhs['nilai_uas'], mhs['nilai_tugas'])
+    return (mhs['nim'], mhs['nama'], mhs['nilai_uts'], mhs['nilai_uas'],
+            mhs['nilai_tugas'], nilai_akhir, tentukan_grade(nilai_akhir))
+
+
+def simpan_mahasiswa_batch(conn, data, ukuran_batch=50000, bangun_ulang_index=False):
+    """
+    Menyimpan banyak data mahasiswa sekaligus (upsert berdasarkan NIM).
+    Data dikirim per batch dengan executemany, satu transaksi per batch.
+    
+    Args:
+        conn (sqlite3.Connection): Koneksi database
+        data (iterable): Dictionary data mahasiswa (boleh berupa generator)
+        ukuran_batch (int): Jumlah baris per transaksi
+        bangun_ulang_index (bool): Hapus index selama proses dan buat ulang
+            di akhir. Jauh lebih cepat untuk load awal jutaan baris.
+    
+    Returns:
+        int: Jumlah baris yang disimpan
+    """
+    if bangun_ulang_index:
+        with conn:
+            conn.execute("DROP INDEX IF EXISTS idx_mahasiswa_akhir")
+            conn.execute("DROP INDEX IF EXISTS idx_mahasiswa_grade")
+    
+    total = 0
+    baris = map(_baris_mahasiswa, data)
+    try:
+        while True:
+            batch = list(islice(baris, ukuran_batch))
+            if not batch:
+                break
+            with conn:
+                conn.executemany(SQL_UPSERT_MAHASISWA, batch)
+            total += len(batch)
+    finally:
+        if bangun_ulang_index:
+            with conn:
+                _buat_index(conn)
+    return total
+
+
+def _ke_dictionary(row):
+    """
+    Mengubah baris database menjadi dictionary mahasiswa
+    
+    Args:
+        row (tuple): (nama, nim, nilai_uts, nilai_uas, nilai_tugas)
+    
+    Returns:
+        dict: Data mahasiswa
+    """
+    return {
+        "nama": row[0],
+        "nim": row[1],
+        "nilai_uts": row[2],
+        "nilai_uas": row[3],
+        "nilai_tugas": row[4]
+    }
+
+
+KOLOM_MAHASISWA = "nama, nim, nilai_uts, nilai_uas, nilai_tugas"
+
+
+def muat_mahasiswa_db(conn):
+    """
+    Memuat seluruh data mahasiswa dari database, urut berdasarkan NIM
+    
+    Args:
+        conn (sqlite3.Connection): Koneksi database
+    
+    Returns:
+        list: List berisi dictionary data mahasiswa
+    """
+    rows = conn.execute(f"SELECT {KOLOM_MAHASISWA} FROM mahasiswa ORDER BY nim")
+    return [_ke_dictionary(row) for row in rows]
+
+
+def filter_berdasarkan_grade_db(conn, grade_target):
+    """
+    Filter mahasiswa berdasarkan grade menggunakan index kolom grade
+    
+    Args:
+        conn (sqlite3.Connection): Koneksi database
+        grade_target (str): Grade yang dicari (A/B/C/D/E)
+    
+    Returns:
+        list: List mahasiswa dengan grade yang sesuai
+    """
+    rows = conn.execute(
+        f"SELECT {KOLOM_MAHASISWA} FROM mahasiswa WHERE grade = ?",
+        (grade_target.upper(),)
+    )
+    return [_ke_dictionary(row) for row in rows]
+
+
+def cari_nilai_tertinggi_db(conn):
+    """
+    Mencari mahasiswa dengan nilai akhir tertinggi menggunakan index
+    
+    Args:
+        conn (sqlite3.Connection): Koneksi database
+    
+    Returns:
+        tuple: (dictionary mahasiswa, nilai akhir) atau None jika kosong
+    """
+    row = conn.execute(
+        f"SELECT {KOLOM_MAHASISWA}, nilai_akhir FROM mahasiswa "
+        "ORDER BY nilai_akhir DESC LIMIT 1"
+    ).fetchone()
+    if row is None:
+        return None
+    return _ke_dictionary(row), row[5]
+
+
+def cari_nilai_terendah_db(conn):
+    """
+    Mencari mahasiswa dengan nilai akhir terendah menggunakan index
+    
+    Args:
+        conn (sqlite3.Connection): Koneksi database
+    
+    Returns:
+        tuple: (dictionary mahasiswa, nilai akhir) atau None jika kosong
+    """
+    row = conn.execute(
+        f"SELECT {KOLOM_MAHASISWA}, nilai_akhir FROM mahasiswa "
+        "ORDER BY nilai_akhir ASC LIMIT 1"
+    ).fetchone()
+    if row is None:
+        return None
+    return _ke_dictionary(row), row[5]
+
+
+def hitung_rata_rata_kelas_db(conn):
+    """
+    Menghitung rata-rata nilai akhir langsung di database
+    
+    Args:
+        conn (sqlite3.Connection): Koneksi database
+    
+    Returns:
+        float: Rata-rata nilai kelas
+    """
+    rata_rata = conn.execute("SELECT AVG(nilai_akhir) FROM mahasiswa").fetchone()[0]
+    if rata_rata is None:
+        return 0
+    return round(rata_rata, 2)
+
+
 def menu_utama():
     """
     Menampilkan menu utama program
     """
+    indeks_mahasiswa = IndeksMahasiswa(data_mahasiswa)
+    
     while True:
         print("\n" + "="*50)
         print("PROGRAM PENGELOLAAN DATA NILAI MAHASISWA")
@@ -293,11 +1434,11 @@ def menu_utama():
         pilihan = input("Pilih menu (1-7): ").strip()
         
         if pilihan == "1":
-            tampilkan_tabel(data_mahasiswa)
+            tampilkan_per_halaman(indeks_mahasiswa)
         
         elif pilihan == "2":
-            mhs_baru = input_mahasiswa_baru()
-            if mhs_baru:
+            mhs_baru = input_mahasiswa_baru(indeks_mahasiswa)
+            if mhs_baru and indeks_mahasiswa.tambah(mhs_baru):
                 data_mahasiswa.append(mhs_baru)
                 print("\nData mahasiswa berhasil ditambahkan!")
         
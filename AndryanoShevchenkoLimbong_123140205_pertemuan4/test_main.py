@@ -0,0 +1,325 @@
+"""
+Pengujian Program Pengelolaan Data Nilai Mahasiswa
+Menjalankan: python -m unittest test_main (dari folder pertemuan4)
+"""
+
+import math
+import random
+import unittest
+from unittest import mock
+
+from main import (DaftarTerurut, HistogramNilai, IndeksMahasiswa, hitung_nilai_akhir,
+                  data_mahasiswa)
+
+# Lebar bin yang diuji, termasuk yang tidak membagi 100 dengan pas
+DAFTAR_LEBAR_BIN = (0.1, 0.25, 0.3, 0.5, 1, 3, 7)
+
+# Persentil yang dicek pada setiap pengujian
+DAFTAR_PERSENTIL = (0, 1, 5, 10, 25, 29, 50, 75, 90, 95, 99, 100)
+
+# Toleransi pembulatan 6 desimal pada hasil persentil
+TOLERANSI = 1e-6
+
+
+def persentil_eksak(nilai_urut, p):
+    """
+    Persentil eksak metode nearest-rank dari daftar nilai yang sudah terurut
+
+    Args:
+        nilai_urut (list): Nilai terurut naik
+        p (float): Persentil (0-100)
+
+    Returns:
+        float: Nilai pada peringkat nearest-rank
+    """
+    peringkat = max(1, math.ceil(p / 100 * len(nilai_urut)))
+    return nilai_urut[peringkat - 1]
+
+
+def buat_nilai_acak(banyak, seed):
+    """
+    Membuat nilai akhir acak yang selalu memuat batas 0 dan 100
+
+    Args:
+        banyak (int): Jumlah nilai acak
+        seed (int): Seed agar pengujian deterministik
+
+    Returns:
+        list: Daftar nilai akhir
+    """
+    acak = random.Random(seed)
+    nilai = [round(acak.uniform(0, 100), 2) for _ in range(banyak)]
+    return nilai + [0, 0, 100, 100]
+
+
+class TestHistogramNilai(unittest.TestCase):
+    """Pengujian galat persentil dan operasi dasar HistogramNilai"""
+
+    def assertDalamGalat(self, histogram, nilai, p):
+        """Memastikan |estimasi - eksak| <= galat_maksimum"""
+        estimasi = histogram.persentil(p)
+        eksak = persentil_eksak(sorted(nilai), p)
+        self.assertLessEqual(
+            abs(estimasi - eksak), histogram.galat_maksimum + TOLERANSI,
+            f"lebar_bin={histogram.lebar_bin}, p={p}: estimasi {estimasi}, eksak {eksak}"
+        )
+
+    # ==================== GALAT PERSENTIL ====================
+
+    def test_persentil_dalam_galat_maksimum(self):
+        """Estimasi persentil tidak melebihi galat maksimum untuk berbagai lebar bin"""
+        nilai = buat_nilai_acak(2000, seed=30)
+        for lebar_bin in DAFTAR_LEBAR_BIN:
+            histogram = HistogramNilai(lebar_bin)
+            for n in nilai:
+                histogram.tambah(n)
+            for p in DAFTAR_PERSENTIL:
+                with self.subTest(lebar_bin=lebar_bin, p=p):
+                    self.assertDalamGalat(histogram, nilai, p)
+
+    def test_persentil_nilai_batas(self):
+        """Nilai tepat 0 dan 100 tetap berada dalam galat maksimum"""
+        for lebar_bin in DAFTAR_LEBAR_BIN:
+            for nilai in ([0], [100], [0, 100], [0] * 5 + [100] * 5):
+                histogram = HistogramNilai(lebar_bin)
+                for n in nilai:
+                    histogram.tambah(n)
+                for p in DAFTAR_PERSENTIL:
+                    with self.subTest(lebar_bin=lebar_bin, nilai=nilai, p=p):
+                        self.assertDalamGalat(histogram, nilai, p)
+
+    def test_persentil_nilai_di_batas_bin(self):
+        """Nilai tepat di batas bin tidak jatuh ke bin sebelumnya"""
+        for lebar_bin in DAFTAR_LEBAR_BIN:
+            nilai = [min(i * lebar_bin, 100) for i in range(math.ceil(100 / lebar_bin) + 1)]
+            histogram = HistogramNilai(lebar_bin)
+            for n in nilai:
+                histogram.tambah(n)
+            for p in DAFTAR_PERSENTIL:
+                with self.subTest(lebar_bin=lebar_bin, p=p):
+                    self.assertDalamGalat(histogram, nilai, p)
+
+    def test_persentil_dengan_banyak(self):
+        """Parameter banyak setara dengan memasukkan nilai berulang kali"""
+        for lebar_bin in DAFTAR_LEBAR_BIN:
+            histogram = HistogramNilai(lebar_bin)
+            histogram.tambah(0, banyak=3)
+            histogram.tambah(42.5, banyak=10)
+            histogram.tambah(100, banyak=2)
+            nilai = [0] * 3 + [42.5] * 10 + [100] * 2
+            self.assertEqual(histogram.jumlah, len(nilai))
+            for p in DAFTAR_PERSENTIL:
+                with self.subTest(lebar_bin=lebar_bin, p=p):
+                    self.assertDalamGalat(histogram, nilai, p)
+
+    # ==================== GABUNG ====================
+
+    def test_gabung_dalam_galat_maksimum(self):
+        """Histogram hasil gabung shard tetap dalam galat maksimum terhadap seluruh data"""
+        shard = [buat_nilai_acak(500, seed=seed) for seed in range(4)]
+        semua_nilai = [n for nilai in shard for n in nilai]
+        for lebar_bin in DAFTAR_LEBAR_BIN:
+            gabungan = HistogramNilai(lebar_bin)
+            for nilai in shard:
+                histogram = HistogramNilai(lebar_bin)
+                for n in nilai:
+                    histogram.tambah(n)
+                self.assertIs(gabungan.gabung(histogram), gabungan)
+            self.assertEqual(gabungan.jumlah, len(semua_nilai))
+            for p in DAFTAR_PERSENTIL:
+                with self.subTest(lebar_bin=lebar_bin, p=p):
+                    self.assertDalamGalat(gabungan, semua_nilai, p)
+
+    def test_gabung_sama_dengan_histogram_tunggal(self):
+        """Gabung dua shard menghasilkan persentil yang sama dengan satu histogram"""
+        nilai = buat_nilai_acak(1000, seed=7)
+        tunggal = HistogramNilai(0.5)
+        kiri = HistogramNilai(0.5)
+        kanan = HistogramNilai(0.5)
+        for i, n in enumerate(nilai):
+            tunggal.tambah(n)
+            (kiri if i % 2 == 0 else kanan).tambah(n)
+        kiri.gabung(kanan)
+
+        for p in DAFTAR_PERSENTIL:
+            self.assertEqual(kiri.persentil(p), tunggal.persentil(p))
+        self.assertEqual(kiri.rata_rata(), tunggal.rata_rata())
+
+    def test_gabung_lebar_bin_berbeda(self):
+        """Gabung histogram dengan lebar bin berbeda ditolak"""
+        with self.assertRaises(ValueError):
+            HistogramNilai(0.5).gabung(HistogramNilai(1))
+
+    # ==================== OPERASI DASAR ====================
+
+    def test_histogram_kosong(self):
+        """Histogram kosong mengembalikan None untuk persentil dan 0 untuk rata-rata"""
+        histogram = HistogramNilai()
+        self.assertEqual(histogram.jumlah, 0)
+        self.assertIsNone(histogram.persentil(50))
+        self.assertIsNone(histogram.median())
+        self.assertEqual(histogram.rata_rata(), 0)
+
+    def test_input_tidak_valid(self):
+        """Nilai, persentil, dan lebar bin di luar rentang ditolak"""
+        histogram = HistogramNilai()
+        for nilai in (-0.01, 100.01):
+            with self.assertRaises(ValueError):
+                histogram.tambah(nilai)
+        histogram.tambah(50)
+        for p in (-1, 101):
+            with self.assertRaises(ValueError):
+                histogram.persentil(p)
+        for lebar_bin in (0, -1):
+            with self.assertRaises(ValueError):
+                HistogramNilai(lebar_bin)
+
+    def test_tambah_mahasiswa(self):
+        """Median dan rata-rata data mahasiswa sesuai perhitungan eksak"""
+        histogram = HistogramNilai()
+        for mhs in data_mahasiswa:
+            histogram.tambah_mahasiswa(mhs)
+        nilai = [
+            hitung_nilai_akhir(mhs['nilai_uts'], mhs['nilai_uas'], mhs['nilai_tugas'])
+            for mhs in data_mahasiswa
+        ]
+
+        self.assertEqual(histogram.jumlah, len(data_mahasiswa))
+        self.assertEqual(histogram.rata_rata(), round(sum(nilai) / len(nilai), 2))
+        self.assertDalamGalat(histogram, nilai, 50)
+
+
+def buat_mahasiswa(nim, acak):
+    """
+    Membuat data mahasiswa dengan nilai acak
+
+    Args:
+        nim (str): NIM mahasiswa
+        acak (random.Random): Sumber angka acak
+
+    Returns:
+        dict: Data mahasiswa
+    """
+    return {
+        "nama": f"Mahasiswa {nim}",
+        "nim": nim,
+        "nilai_uts": acak.randint(0, 100),
+        "nilai_uas": acak.randint(0, 100),
+        "nilai_tugas": acak.randint(0, 100),
+    }
+
+
+class TestDaftarTerurut(unittest.TestCase):
+    """DaftarTerurut selalu sama dengan list biasa yang diurutkan"""
+
+    def test_acak_dibanding_sorted(self):
+        """Tambah/hapus acak dengan ember kecil (sering dibelah dan dibuang)"""
+        acak = random.Random(38)
+        with mock.patch.object(DaftarTerurut, "UKURAN_EMBER", 4):
+            daftar = DaftarTerurut(acak.sample(range(1000), 50))
+            acuan = sorted(daftar.setelah(None, 1000))
+            for _ in range(3000):
+                kunci = acak.randrange(1000)
+                if kunci in acuan:
+                    self.assertTrue(daftar.hapus(kunci))
+                    acuan.remove(kunci)
+                else:
+                    self.assertFalse(daftar.hapus(kunci))
+                    daftar.tambah(kunci)
+                    acuan.append(kunci)
+                    acuan.sort()
+                self.assertEqual(len(daftar), len(acuan))
+
+            self.assertEqual(daftar.setelah(None, len(acuan) + 1), acuan)
+            for batas in (-1, 0, 499, 500, 999, 1000):
+                with self.subTest(batas=batas):
+                    sisa = [kunci for kunci in acuan if kunci > batas]
+                    self.assertEqual(daftar.setelah(batas, 7), sisa[:7])
+
+    def test_daftar_kosong(self):
+        """Daftar kosong dan daftar yang dikosongkan kembali"""
+        daftar = DaftarTerurut()
+        self.assertEqual(daftar.setelah(None, 5), [])
+        self.assertEqual(daftar.setelah(3, 5), [])
+        self.assertFalse(daftar.hapus(3))
+        daftar.tambah(3)
+        self.assertTrue(daftar.hapus(3))
+        self.assertEqual(len(daftar), 0)
+        daftar.tambah(1)
+        self.assertEqual(daftar.setelah(None, 5), [1])
+
+
+class TestIndeksMahasiswa(unittest.TestCase):
+    """Halaman IndeksMahasiswa tetap benar setelah tambah, perbarui, dan hapus"""
+
+    def semua_halaman(self, indeks, urut):
+        """Menggabungkan NIM dari seluruh halaman"""
+        return [mhs['nim'] for halaman, _ in indeks.iter_halaman(7, urut) for mhs in halaman]
+
+    def cek_urutan(self, indeks):
+        """Membandingkan halaman dengan pengurutan ulang seluruh data"""
+        data = indeks.daftar()
+        self.assertEqual(self.semua_halaman(indeks, "nim"), sorted(mhs['nim'] for mhs in data))
+        nilai = sorted((-indeks.nilai_akhir(mhs['nim']), mhs['nim']) for mhs in data)
+        self.assertEqual(self.semua_halaman(indeks, "nilai"), [nim for _, nim in nilai])
+
+    def test_halaman_setelah_perubahan(self):
+        """Urutan NIM dan nilai diperbarui di tempat, bukan diurutkan ulang"""
+        acak = random.Random(28)
+        with mock.patch.object(DaftarTerurut, "UKURAN_EMBER", 4):
+            indeks = IndeksMahasiswa(buat_mahasiswa(f"23{i:05d}", acak) for i in range(60))
+            self.cek_urutan(indeks)
+            for langkah in range(300):
+                nim = f"23{acak.randrange(80):05d}"
+                aksi = langkah % 3
+                if aksi == 0:
+                    indeks.tambah(buat_mahasiswa(nim, acak))
+                elif aksi == 1:
+                    indeks.perbarui_nilai(nim, nilai_uas=acak.randint(0, 100))
+                else:
+                    indeks.hapus(nim)
+                self.cek_urutan(indeks)
+
+    def test_kursor_halaman(self):
+        """Kursor None hanya pada halaman terakhir"""
+        acak = random.Random(1)
+        indeks = IndeksMahasiswa(buat_mahasiswa(f"23{i:05d}", acak) for i in range(14))
+        halaman, kursor = indeks.halaman(7)
+        self.assertEqual(kursor, "2300006")
+        halaman, kursor = indeks.halaman(7, setelah=kursor)
+        self.assertEqual([mhs['nim'] for mhs in halaman][-1], "2300013")
+        self.assertIsNone(kursor)
+        self.assertEqual(IndeksMahasiswa().halaman(7), ([], None))
+
+    def test_gabung_koreksi_tidak_valid(self):
+        """Koreksi tidak valid di mana pun membatalkan seluruh koreksi"""
+        indeks = IndeksMahasiswa([dict(mhs) for mhs in data_mahasiswa])
+        sebelum = [dict(mhs) for mhs in indeks.daftar()]
+        nim = [mhs['nim'] for mhs in sebelum]
+        for salah in ({"nim": nim[2], "nilai_uts": 101}, {"nim": nim[2], "nilai_kuis": 90}):
+            with self.subTest(salah=salah):
+                with self.assertRaises(ValueError) as konteks:
+                    indeks.gabung_koreksi(
+                        [{"nim": nim[0], "nilai_uts": 10}, {"nim": nim[1], "nilai_uas": 20}],
+                        [salah, {"nim": nim[3], "nilai_tugas": 30}]
+                    )
+                self.assertIn(nim[2], str(konteks.exception))
+                self.assertEqual(indeks.daftar(), sebelum)
+
+    def test_gabung_koreksi_valid(self):
+        """Koreksi valid diterapkan berurutan, NIM tidak dikenal dilaporkan"""
+        indeks = IndeksMahasiswa([dict(mhs) for mhs in data_mahasiswa])
+        nim = data_mahasiswa[0]['nim']
+        tidak_ditemukan = indeks.gabung_koreksi(
+            [{"nim": nim, "nilai_uts": 10}, {"nim": "0000000", "nilai_uts": 50}],
+            [{"nim": nim, "nilai_uts": 20, "nilai_uas": 30}]
+        )
+        self.assertEqual(tidak_ditemukan, ["0000000"])
+        self.assertEqual(indeks.cari(nim)['nilai_uts'], 20)
+        self.assertEqual(indeks.cari(nim)['nilai_uas'], 30)
+        self.assertEqual(indeks.nilai_akhir(nim),
+                         hitung_nilai_akhir(20, 30, indeks.cari(nim)['nilai_tugas']))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,354 @@
+"""
+Benchmark Sistem Manajemen Perpustakaan
+Mengukur performa fitur-fitur Library dengan data sintetis
+
+Cara menjalankan:
+    python benchmark.py snapshot
+    python benchmark.py snapshot --items 500000 --storage sqlite
+    python benchmark.py sharded --items 500000
+    python benchmark.py recommend --items 100000 --loans 5000000
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, Iterator, List, Optional
+
+from main import (Book, CoBorrowIndex, DVD, Library, LibraryItem, Magazine, ShardedLibrary,
+                  SQLiteStorage)
+
+
+# ==================== HELPER ====================
+def build_library(n_items: int, storage_name: str = "memory") -> Library:
+    """
+    Membuat Library berisi n_items item sintetis (campuran Buku, Majalah, DVD)
+
+    Args:
+        n_items: Jumlah item
+        storage_name: "memory" atau "sqlite" (file sementara)
+    """
+    storage = None
+    if storage_name == "sqlite":
+        path = os.path.join(tempfile.mkdtemp(), "benchmark.db")
+        storage = SQLiteStorage(path)
+
+    library = Library("Perpustakaan Benchmark", storage)
+    library.add_items(synthetic_items(n_items))
+    return library
+
+
+def synthetic_items(n_items: int) -> List[LibraryItem]:
+    """Membuat n_items item sintetis (campuran Buku, Majalah, DVD)"""
+    items: List[LibraryItem] = []
+    for i in range(n_items):
+        if i % 3 == 0:
+            items.append(Book(f"B{i}", f"Buku {i}", "Penulis", 2000 + i % 25,
+                              f"978-{i}", 100 + i % 500, "Penerbit"))
+        elif i % 3 == 1:
+            items.append(Magazine(f"M{i}", f"Majalah {i}", "Editor", 2000 + i % 25,
+                                  i % 200, "Januari"))
+        else:
+            items.append(DVD(f"D{i}", f"Film {i}", "Studio", 2000 + i % 25,
+                             90 + i % 60, "Drama", "Sutradara"))
+    return items
+
+
+def percentile(samples: List[float], p: float) -> float:
+    """Persentil (nearest-rank) dari list sampel"""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(p / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+# ==================== SNAPSHOT BENCHMARK ====================
+def full_report(library: Library, lock: Optional[threading.Lock] = None) -> int:
+    """
+    Laporan lengkap seperti display_all_items, tapi hasilnya tidak dicetak
+    Jika lock diberikan, laporan memegang lock global selama berjalan
+    (mensimulasikan pendekatan tanpa snapshot)
+    """
+    if lock is not None:
+        with lock:
+            with library.snapshot() as view:
+                return len("\n".join(str(state) for state in view.iter_items()))
+    with library.snapshot() as view:
+        return len("\n".join(str(state) for state in view.iter_items()))
+
+
+def run_writer(library: Library, item_ids: List[str], duration: float,
+               lock: Optional[threading.Lock], latencies: List[float]) -> None:
+    """Penulis: borrow lalu return item acak, mencatat latency setiap operasi"""
+    rng = random.Random(42)
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        item_id = rng.choice(item_ids)
+        for operation in (library.borrow_many, library.return_many):
+            start = time.perf_counter()
+            if lock is not None:
+                with lock:
+                    operation([item_id])
+            else:
+                operation([item_id])
+            latencies.append(time.perf_counter() - start)
+
+
+def benchmark_snapshot(n_items: int, duration: float, storage_name: str) -> None:
+    """
+    Mengukur latency penulis (borrow/return) pada tiga skenario:
+    tanpa laporan, dengan laporan berbasis snapshot, dan dengan laporan
+    yang memegang lock global
+    """
+    library = build_library(n_items, storage_name)
+    item_ids = [f"B{i}" for i in range(0, n_items, 3)]
+    # Snapshot pertama membangun riwayat versi (sekali saja), tidak ikut diukur
+    library.snapshot().close()
+
+    print(f"\nSnapshot benchmark: {n_items} item, storage={storage_name}, {duration}s per skenario")
+    print(f"{'Skenario':<22} {'Writes':>8} {'p50 (ms)':>10} {'p99 (ms)':>10} "
+          f"{'max (ms)':>10} {'Reports':>8} {'Report (s)':>11}")
+
+    for scenario in ("tanpa laporan", "laporan + snapshot", "laporan + lock global"):
+        lock = threading.Lock() if scenario == "laporan + lock global" else None
+        latencies: List[float] = []
+        report_times: List[float] = []
+        stop = threading.Event()
+
+        def reporter() -> None:
+            while not stop.is_set():
+                start = time.perf_counter()
+                full_report(library, lock)
+                report_times.append(time.perf_counter() - start)
+
+        reader = None
+        if scenario != "tanpa laporan":
+            reader = threading.Thread(target=reporter)
+            reader.start()
+
+        run_writer(library, item_ids, duration, lock, latencies)
+        stop.set()
+        if reader is not None:
+            reader.join()
+
+        report_avg = sum(report_times) / len(report_times) if report_times else 0
+        print(f"{scenario:<22} {len(latencies):>8} "
+              f"{percentile(latencies, 50) * 1000:>10.3f} "
+              f"{percentile(latencies, 99) * 1000:>10.3f} "
+              f"{max(latencies) * 1000:>10.3f} "
+              f"{len(report_times):>8} {report_avg:>11.3f}")
+
+
+# ==================== SHARDED BENCHMARK ====================
+def measure_throughput(operation: Callable[[int], object], duration: float,
+                       clients: int) -> float:
+    """
+    Menjalankan operation dari beberapa thread client selama duration detik
+
+    Returns:
+        float: Jumlah operasi per detik
+    """
+    counts = [0] * clients
+    deadline = time.perf_counter() + duration
+
+    def client(index: int) -> None:
+        rng = random.Random(index)
+        while time.perf_counter() < deadline:
+            operation(rng.randrange(1_000_000))
+            counts[index] += 1
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sum(counts) / duration
+
+
+def benchmark_sharded(n_items: int, duration: float, storage_name: str) -> None:
+    """
+    Membandingkan throughput Library biasa dengan ShardedLibrary untuk
+    search_by_title (fan-out ke semua shard) dan search_by_id (ke satu shard)
+    dengan beberapa thread client
+    """
+    items = synthetic_items(n_items)
+    clients = os.cpu_count() or 1
+    storage_path = os.path.join(tempfile.mkdtemp(), "sharded.db") if storage_name == "sqlite" else None
+
+    print(f"\nSharded benchmark: {n_items} item, storage={storage_name}, "
+          f"{clients} client thread, {duration}s per skenario")
+    print(f"{'Mode':<18} {'search_by_title/s':>18} {'search_by_id/s':>16}")
+
+    # Keyword dan ID acak supaya cache hasil pencarian tidak membantu
+    def title_query(library) -> Callable[[int], object]:
+        return lambda n: library.search_by_title(f"Buku {n % n_items}x")
+
+    def id_query(library) -> Callable[[int], object]:
+        return lambda n: library.search_by_id(f"B{(n % n_items) // 3 * 3}")
+
+    library = build_library(n_items, storage_name)
+    print(f"{'Library':<18} {measure_throughput(title_query(library), duration, clients):>18.1f} "
+          f"{measure_throughput(id_query(library), duration, clients):>16.1f}")
+
+    shard_counts = sorted({1, 2, 4, clients})
+    for shards in shard_counts:
+        path = f"{storage_path}.{shards}" if storage_path else None
+        with ShardedLibrary("Perpustakaan Benchmark", shards, path) as sharded:
+            sharded.add_items(items)
+            print(f"{f'Sharded x{shards}':<18} "
+                  f"{measure_throughput(title_query(sharded), duration, clients):>18.1f} "
+                  f"{measure_throughput(id_query(sharded), duration, clients):>16.1f}")
+
+
+# ==================== RECOMMENDATION BENCHMARK ====================
+def synthetic_sessions(n_items: int, n_loans: int, seed: int = 7) -> Iterator[tuple]:
+    """
+    Sesi peminjaman sintetis sampai total n_loans peminjaman
+    Item dikelompokkan per topik (20 item) dengan popularitas topik yang timpang;
+    sebagian besar item dalam satu sesi berasal dari topik yang sama,
+    sisanya item acak dari seluruh koleksi.
+
+    Yields:
+        tuple: (ID peminjam, waktu mulai sesi, list ID item)
+    """
+    rng = random.Random(seed)
+    item_ids = [item.id for item in synthetic_items(n_items)]
+    topic_size = 20
+    n_topics = max(1, n_items // topic_size)
+    clock = 0.0
+    loans = 0
+    while loans < n_loans:
+        topic = int(n_topics * rng.random() ** 3) * topic_size
+        session = []
+        for _ in range(rng.randint(1, 6)):
+            if rng.random() < 0.8:
+                session.append(item_ids[min(n_items - 1, topic + rng.randrange(topic_size))])
+            else:
+                session.append(rng.choice(item_ids))
+        loans += len(session)
+        clock += rng.expovariate(1.0)
+        yield f"P{rng.randrange(n_items // 2 + 1)}", clock, session
+
+
+def naive_recommend(history: List[List[str]], sessions_of: Dict[str, List[int]],
+                    item_id: str, top_k: int) -> List[tuple]:
+    """Rekomendasi tanpa index: hitung ulang dari semua sesi yang memuat item_id"""
+    counts: Counter = Counter()
+    for index in sessions_of.get(item_id, ()):
+        counts.update(other for other in set(history[index]) if other != item_id)
+    return sorted(counts.items(), key=lambda pair: (-pair[1], pair[0]))[:top_k]
+
+
+def benchmark_recommend(n_items: int, duration: float, storage_name: str,
+                        n_loans: int = 2_000_000) -> None:
+    """
+    Mengukur CoBorrowIndex pada n_loans peminjaman sintetis:
+    throughput pencatatan, ukuran index, latency lookup dibandingkan
+    menghitung ulang dari riwayat, recall top-K, dan throughput borrow_many
+    dengan patron_id melalui Library
+    """
+    top_k = 10
+    index = CoBorrowIndex(top_k)
+    history: List[List[str]] = []
+    sessions_of: Dict[str, List[int]] = {}
+    record_time = 0.0
+    for patron_id, clock, session in synthetic_sessions(n_items, n_loans):
+        start = time.perf_counter()
+        for offset, item_id in enumerate(session):
+            index.record(patron_id, item_id, clock + offset)
+        record_time += time.perf_counter() - start
+        for item_id in set(session):
+            sessions_of.setdefault(item_id, []).append(len(history))
+        history.append(session)
+    stats = index.stats()
+
+    print(f"\nRecommendation benchmark: {n_items} item, {stats['loans']} peminjaman, "
+          f"{len(history)} sesi, top_k={top_k}")
+    print(f"Pencatatan     : {stats['loans'] / record_time:,.0f} peminjaman/s "
+          f"({stats['pairs']} pasangan)")
+    print(f"Ukuran index   : {stats['candidates']} kandidat untuk {stats['items']} item "
+          f"(maks {stats['max_candidates_per_item']}/item), {stats['open_sessions']} sesi terbuka")
+
+    # Item paling populer = kasus terberat untuk scan riwayat
+    rng = random.Random(1)
+    popular = sorted(sessions_of, key=lambda item_id: -len(sessions_of[item_id]))[:1000]
+    queries = [rng.choice(popular) for _ in range(200)]
+
+    print(f"{'Lookup':<15} {'p50 (us)':>10} {'p99 (us)':>10}")
+    for name, lookup in (
+        ("index (cold)", lambda item_id: index.recommend(item_id)),
+        ("index (warm)", lambda item_id: index.recommend(item_id)),
+        ("scan riwayat", lambda item_id: naive_recommend(history, sessions_of, item_id, top_k)),
+    ):
+        latencies = []
+        deadline = time.perf_counter() + duration
+        for item_id in queries:
+            start = time.perf_counter()
+            lookup(item_id)
+            latencies.append(time.perf_counter() - start)
+            if time.perf_counter() > deadline:
+                break
+        print(f"{name:<15} {percentile(latencies, 50) * 1e6:>10.1f} "
+              f"{percentile(latencies, 99) * 1e6:>10.1f}")
+
+    # Recall: berapa banyak top-K eksak yang juga ada di top-K index setelah pruning
+    hits = total = 0
+    for item_id in queries[:50]:
+        exact = {other for other, _ in naive_recommend(history, sessions_of, item_id, top_k)}
+        hits += len(exact & {other for other, _ in index.recommend(item_id)})
+        total += len(exact)
+    print(f"Recall top-{top_k:<4}: {hits / max(1, total):.1%}")
+
+    # End-to-end lewat Library: pencatatan lewat borrow_many, lalu
+    # Library.recommend (lookup index + satu get_many ke storage)
+    library = build_library(n_items, storage_name)
+    loans = 0
+    start = time.perf_counter()
+    for patron_id, _, session in synthetic_sessions(n_items, 100_000, seed=11):
+        session = list(dict.fromkeys(session))
+        if library.borrow_many(session, patron_id):
+            library.return_many(session)
+            loans += len(session)
+    elapsed = time.perf_counter() - start
+    print(f"Library borrow_many + return_many dengan patron_id: "
+          f"{loans / elapsed:,.0f} peminjaman/s (storage={storage_name})")
+
+    latencies = []
+    for item_id in queries:
+        start = time.perf_counter()
+        library.recommend(item_id, 5)
+        latencies.append(time.perf_counter() - start)
+    print(f"Library.recommend(id, 5): p50 {percentile(latencies, 50) * 1e6:.1f} us, "
+          f"p99 {percentile(latencies, 99) * 1e6:.1f} us")
+
+
+# ==================== MAIN ====================
+BENCHMARKS: dict = {
+    "snapshot": benchmark_snapshot,
+    "sharded": benchmark_sharded,
+    "recommend": benchmark_recommend,
+}
+
+
+def main() -> None:
+    """Parsing argumen dan menjalankan benchmark yang dipilih"""
+    parser = argparse.ArgumentParser(description="Benchmark Sistem Manajemen Perpustakaan")
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS))
+    parser.add_argument("--items", type=int, default=200_000, help="Jumlah item sintetis")
+    parser.add_argument("--duration", type=float, default=3.0, help="Durasi per skenario (detik)")
+    parser.add_argument("--storage", choices=("memory", "sqlite"), default="memory")
+    parser.add_argument("--loans", type=int, default=2_000_000,
+                        help="Jumlah peminjaman sintetis (benchmark recommend)")
+    args = parser.parse_args()
+
+    runner: Callable = BENCHMARKS[args.benchmark]
+    if args.benchmark == "recommend":
+        runner(args.items, args.duration, args.storage, args.loans)
+    else:
+        runner(args.items, args.duration, args.storage)
+
+
+if __name__ == "__main__":
+    main()
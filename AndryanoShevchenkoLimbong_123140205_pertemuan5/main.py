@@ -3,9 +3,22 @@ Sistem Manajemen Perpustakaan Sederhana
 Implementasi konsep OOP: Abstract Class, Inheritance, Encapsulation, Polymorphism
 """
 
+import functools
+import heapq
+import json
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+import zlib
 from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
 from datetime import datetime
-from typing import List, Optional
+from itertools import islice
+from operator import itemgetter
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
 
 
 # ==================== ABSTRACT BASE CLASS ====================
@@ -20,6 +33,7 @@ class LibraryItem(ABC):
         _author (str): Penulis/pembuat (protected)
         _year (int): Tahun publikasi (protected)
         _is_available (bool): Status ketersediaan (protected)
+        _listeners (List[Callable]): Callback perubahan data (protected)
     """
     
     def __init__(self, item_id: str, title: str, author: str, year: int):
@@ -32,6 +46,7 @@ class LibraryItem(ABC):
         self._author = author
         self._year = year
         self._is_available = True
+        self._listeners: List[Callable] = []
     
     # ========== PROPERTY DECORATORS (Encapsulation) ==========
     @property
@@ -52,7 +67,10 @@ class LibraryItem(ABC):
         """
         if not value or not isinstance(value, str):
             raise ValueError("Judul harus berupa string yang tidak kosong")
+        old_title = self._title
         self._title = value
+        for listener in list(self._listeners):
+            listener(self, "title", old_title)
     
     @property
     def author(self) -> str:
@@ -86,6 +104,23 @@ class LibraryItem(ABC):
         pass
     
     # ========== CONCRETE METHODS ==========
+    def add_listener(self, listener: Callable) -> None:
+        """
+        Mendaftarkan callback yang dipanggil saat data item berubah
+        Callback menerima (item, nama_field, nilai_lama)
+        """
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+    
+    def __getstate__(self) -> dict:
+        """
+        State untuk pickle (misalnya dikirim antar proses)
+        Listener tidak ikut karena terikat ke Library di proses asal
+        """
+        state = self.__dict__.copy()
+        state["_listeners"] = []
+        return state
+
     def borrow(self) -> bool:
         """
         Method untuk meminjam item
@@ -325,156 +360,1851 @@ Status     : {status}
         return "DVD"
 
 
-# ==================== LIBRARY CLASS ====================
-class Library:
+# ==================== SNAPSHOT (MVCC) ====================
+class ItemState(NamedTuple):
     """
-    Class untuk mengelola koleksi perpustakaan
-    Menerapkan Encapsulation untuk melindungi data koleksi
+    Salinan read-only dari data sebuah item pada satu versi tertentu
+    Dipakai oleh snapshot supaya pembaca tidak menyentuh object yang sedang diubah
+    """
+    id: str
+    title: str
+    author: str
+    year: int
+    item_type: str
+    is_available: bool
     
-    Attributes:
-        __items (List[LibraryItem]): List item perpustakaan (private)
-        __name (str): Nama perpustakaan (private)
+    @classmethod
+    def from_item(cls, item: LibraryItem) -> "ItemState":
+        """Membuat ItemState dari object LibraryItem"""
+        return cls(item.id, item.title, item.author, item.year,
+                   item.get_item_type(), item.is_available)
+    
+    def __str__(self) -> str:
+        """Format yang sama dengan LibraryItem.__str__"""
+        status = "Tersedia" if self.is_available else "Dipinjam"
+        return f"[{self.id}] {self.title} - {self.author} ({self.year}) - {status}"
+
+
+class StorageSnapshot(ABC):
     """
+    Tampilan read-only dari isi storage pada satu titik waktu.
+    Penulis (borrow/return/add) tetap bisa berjalan selama snapshot dibaca,
+    dan perubahan mereka tidak terlihat di snapshot ini.
+    Gunakan dengan `with storage.snapshot() as view:` agar resource dilepas.
+    """
+    
+    @abstractmethod
+    def iter_items(self) -> Iterator[ItemState]:
+        """Iterasi semua item sesuai urutan penambahan"""
+        pass
+    
+    @abstractmethod
+    def count(self) -> int:
+        """Jumlah seluruh item"""
+        pass
     
-    def __init__(self, name: str = "Perpustakaan Digital"):
+    @abstractmethod
+    def page(self, after: Optional[str], limit: int,
+             item_type: Optional[str] = None) -> List[ItemState]:
         """
-        Constructor Library
-        Menggunakan private attributes untuk encapsulation
+        Maksimal limit item dengan ID > after (None = dari awal), urut berdasarkan ID
+        Jika item_type diisi, hanya item dengan kategori tersebut
         """
-        self.__items: List[LibraryItem] = []
-        self.__name = name
+        pass
+    
+    def iter_pages(self, page_size: int, item_type: Optional[str] = None) -> Iterator[List[ItemState]]:
+        """Generator halaman item urut berdasarkan ID pada titik waktu snapshot"""
+        after = None
+        while True:
+            states = self.page(after, page_size, item_type)
+            if states:
+                yield states
+            if len(states) < page_size:
+                return
+            after = states[-1].id
+    
+    def count_available(self) -> int:
+        """Jumlah item yang tersedia"""
+        return sum(1 for state in self.iter_items() if state.is_available)
+    
+    def count_by_type(self) -> Dict[str, int]:
+        """Jumlah item per kategori"""
+        type_count: Dict[str, int] = {}
+        for state in self.iter_items():
+            type_count[state.item_type] = type_count.get(state.item_type, 0) + 1
+        return type_count
+    
+    def close(self) -> None:
+        """Melepas snapshot"""
+        pass
+    
+    def __enter__(self) -> "StorageSnapshot":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+# ==================== PAGINATION ====================
+class ItemPage(NamedTuple):
+    """
+    Satu halaman hasil keyset pagination
+    next_cursor dipakai sebagai argumen `after` untuk halaman berikutnya,
+    None jika ini halaman terakhir
+    """
+    items: List[LibraryItem]
+    next_cursor: Optional[str]
+
+
+class SortedIndex:
+    """
+    Index terurut berdasarkan key (ID item) untuk keyset pagination
+    Key disimpan di list terurut, sehingga awal halaman ditemukan dengan
+    binary search tanpa memindai halaman-halaman sebelumnya
+    
+    Attributes:
+        __keys (List[str]): Key terurut (private)
+        __values (list): Value sesuai posisi key (private)
+    """
+    
+    # Batch lebih besar dari ini digabung dengan sort, bukan disisipkan satu per satu
+    BULK_THRESHOLD = 64
+    
+    def __init__(self):
+        """Constructor SortedIndex"""
+        self.__keys: List[str] = []
+        self.__values: list = []
+    
+    def __len__(self) -> int:
+        return len(self.__keys)
+    
+    def insert(self, key: str, value) -> None:
+        """Menyisipkan satu key pada posisinya (key harus unik)"""
+        position = bisect_left(self.__keys, key)
+        self.__keys.insert(position, key)
+        self.__values.insert(position, value)
+    
+    def insert_many(self, pairs: List[tuple]) -> None:
+        """Menyisipkan banyak pasangan (key, value) sekaligus"""
+        if len(pairs) <= self.BULK_THRESHOLD:
+            for key, value in pairs:
+                self.insert(key, value)
+            return
+        merged = sorted(list(zip(self.__keys, self.__values)) + pairs, key=itemgetter(0))
+        self.__keys = [key for key, _ in merged]
+        self.__values = [value for _, value in merged]
+    
+    def get(self, key: str):
+        """Value untuk key tertentu dengan binary search, None jika tidak ada"""
+        position = bisect_left(self.__keys, key)
+        if position < len(self.__keys) and self.__keys[position] == key:
+            return self.__values[position]
+        return None
+    
+    def page(self, after: Optional[str], limit: int) -> list:
+        """Maksimal limit value dengan key > after, urut berdasarkan key"""
+        start = 0 if after is None else bisect_right(self.__keys, after)
+        return self.__values[start:start + limit]
+
+
+# ==================== STORAGE BACKEND ====================
+class StorageBackend(ABC):
+    """
+    Abstract Base Class untuk tempat penyimpanan item perpustakaan.
+    Library hanya bergantung pada interface ini sehingga media penyimpanan
+    (list di memori, database SQLite, dll) bisa diganti tanpa mengubah Library.
+    
+    Attributes:
+        items_scanned (int): Total item yang diperiksa/dibaca oleh storage
+        thread_items_scanned (int): Item yang diperiksa oleh thread yang sedang
+            berjalan, dipakai oleh Instrumentation untuk mendeteksi operasi yang
+            scan-heavy tanpa tercampur scan dari thread lain
+        live_objects (bool): True jika storage mengembalikan object yang sama
+            dengan yang tersimpan, sehingga perubahan status langsung terlihat
+    """
+    
+    live_objects: bool = True
+    
+    def __init__(self):
+        """Constructor StorageBackend (penghitung item yang di-scan)"""
+        self.__scanned = 0
+        self.__scanned_lock = threading.Lock()
+        self.__scanned_local = threading.local()
     
-    # ========== PROPERTY DECORATORS ==========
     @property
-    def name(self) -> str:
-        """Getter untuk nama perpustakaan"""
-        return self.__name
+    def items_scanned(self) -> int:
+        """Total item yang di-scan dari semua thread"""
+        return self.__scanned
     
     @property
-    def total_items(self) -> int:
-        """Getter untuk total item (computed property)"""
+    def thread_items_scanned(self) -> int:
+        """Item yang di-scan oleh thread yang sedang berjalan"""
+        return getattr(self.__scanned_local, "count", 0)
+    
+    def _count_scanned(self, count: int) -> None:
+        """Mencatat item yang di-scan (dipanggil storage dan snapshot-nya)"""
+        self.__scanned_local.count = self.thread_items_scanned + count
+        with self.__scanned_lock:
+            self.__scanned += count
+    
+    @abstractmethod
+    def add(self, item: LibraryItem) -> bool:
+        """Menyimpan satu item, False jika ID sudah ada"""
+        pass
+    
+    @abstractmethod
+    def add_many(self, items: Iterable[LibraryItem]) -> List[LibraryItem]:
+        """Menyimpan banyak item sekaligus, mengembalikan item yang tersimpan"""
+        pass
+    
+    @abstractmethod
+    def get(self, item_id: str) -> Optional[LibraryItem]:
+        """Mengambil item berdasarkan ID"""
+        pass
+    
+    @abstractmethod
+    def search_title(self, keyword: str) -> List[LibraryItem]:
+        """Mencari item yang judulnya mengandung keyword (case-insensitive)"""
+        pass
+    
+    @abstractmethod
+    def get_many(self, item_ids: Iterable[str]) -> Dict[str, LibraryItem]:
+        """Mengambil banyak item sekaligus, mengembalikan dict ID -> item yang ditemukan"""
+        pass
+    
+    @abstractmethod
+    def set_available(self, item: LibraryItem, available: bool) -> bool:
+        """
+        Mengubah status ketersediaan item
+        Returns True jika status berubah, False jika status sudah sama
+        """
+        pass
+    
+    @abstractmethod
+    def set_available_many(self, items: List[LibraryItem], available: bool) -> List[str]:
+        """
+        Mengubah status banyak item secara atomik (semua atau tidak sama sekali)
+        Returns list ID yang statusnya sudah sama; jika tidak kosong, tidak ada yang diubah
+        """
+        pass
+    
+    @abstractmethod
+    def update(self, item: LibraryItem) -> None:
+        """Menyimpan perubahan data item (misalnya judul)"""
+        pass
+    
+    @abstractmethod
+    def iter_items(self) -> Iterator[LibraryItem]:
+        """Iterasi semua item sesuai urutan penambahan"""
+        pass
+    
+    @abstractmethod
+    def page(self, after: Optional[str], limit: int,
+             item_type: Optional[str] = None) -> List[LibraryItem]:
+        """
+        Maksimal limit item dengan ID > after (None = dari awal), urut berdasarkan ID
+        Jika item_type diisi, hanya item dengan kategori tersebut
+        """
+        pass
+    
+    @abstractmethod
+    def count(self) -> int:
+        """Jumlah seluruh item"""
+        pass
+    
+    @abstractmethod
+    def count_available(self) -> int:
+        """Jumlah item yang tersedia"""
+        pass
+    
+    @abstractmethod
+    def count_by_type(self) -> Dict[str, int]:
+        """Jumlah item per kategori (get_item_type)"""
+        pass
+    
+    @abstractmethod
+    def snapshot(self) -> StorageSnapshot:
+        """Membuat snapshot read-only point-in-time"""
+        pass
+
+
+class InMemoryStorage(StorageBackend):
+    """
+    Penyimpanan default berbasis list Python
+    Semua data hilang ketika program selesai
+    
+    Snapshot memakai MVCC: setiap perubahan item dicatat sebagai versi baru
+    (ItemState) di riwayat item tersebut. Pembaca snapshot memilih versi terbaru
+    yang tidak lebih baru dari versi snapshot-nya, sehingga tidak perlu lock
+    selama membaca. Riwayat baru dibuat saat snapshot pertama diminta.
+    
+    Attributes:
+        __items (List[LibraryItem]): List item perpustakaan (private)
+        __by_id (SortedIndex): Item terurut berdasarkan ID (private)
+        __by_type (Dict[str, SortedIndex]): Kategori -> item terurut berdasarkan ID (private)
+        __lock (threading.Lock): Lock singkat untuk perubahan data (private)
+        __version (int): Versi data terakhir (private)
+        __history (Dict[str, tuple]): ID -> tuple (versi, ItemState) (private)
+        __readers (Dict[int, int]): Versi snapshot aktif -> jumlah pembaca (private)
+    """
+    
+    def __init__(self):
+        """Constructor InMemoryStorage"""
+        super().__init__()
+        self.__items: List[LibraryItem] = []
+        self.__by_id = SortedIndex()
+        self.__by_type: Dict[str, SortedIndex] = {}
+        self.__lock = threading.Lock()
+        self.__version = 0
+        self.__history: Optional[Dict[str, tuple]] = None
+        self.__readers: Dict[int, int] = {}
+    
+    def add(self, item: LibraryItem) -> bool:
+        """Menambahkan item ke list jika ID belum dipakai"""
+        with self.__lock:
+            if self.__by_id.get(item.id) is not None:
+                return False
+            self.__items.append(item)
+            self.__index([item])
+            self.__record(item)
+        return True
+    
+    def add_many(self, items: Iterable[LibraryItem]) -> List[LibraryItem]:
+        """
+        Menambahkan banyak item, item dengan ID duplikat dilewati
+        ID lama dicek lewat index terurut, ID di dalam batch lewat set
+        """
+        added = []
+        with self.__lock:
+            batch_ids = set()
+            for item in items:
+                if item.id in batch_ids or self.__by_id.get(item.id) is not None:
+                    continue
+                batch_ids.add(item.id)
+                self.__items.append(item)
+                self.__record(item)
+                added.append(item)
+            self.__index(added)
+        return added
+    
+    def get(self, item_id: str) -> Optional[LibraryItem]:
+        """Mencari item berdasarkan ID dengan binary search pada index terurut"""
+        with self.__lock:
+            item = self.__by_id.get(item_id)
+        if item is not None:
+            self._count_scanned(1)
+        return item
+    
+    def search_title(self, keyword: str) -> List[LibraryItem]:
+        """Mencari item berdasarkan judul (partial match)"""
+        keyword_lower = keyword.lower()
+        self._count_scanned(len(self.__items))
+        return [
+            item for item in self.__items
+            if keyword_lower in item.title.lower()
+        ]
+    
+    def get_many(self, item_ids: Iterable[str]) -> Dict[str, LibraryItem]:
+        """Mencari banyak ID lewat index terurut dalam satu kali lock"""
+        found: Dict[str, LibraryItem] = {}
+        with self.__lock:
+            for item_id in set(item_ids):
+                item = self.__by_id.get(item_id)
+                if item is not None:
+                    found[item_id] = item
+        self._count_scanned(len(found))
+        return found
+    
+    def set_available(self, item: LibraryItem, available: bool) -> bool:
+        """Mengubah status item langsung pada object-nya"""
+        with self.__lock:
+            changed = item.return_item() if available else item.borrow()
+            if changed:
+                self.__record(item)
+        return changed
+    
+    def set_available_many(self, items: List[LibraryItem], available: bool) -> List[str]:
+        """Semua item dicek dulu, baru diubah jika semuanya valid"""
+        with self.__lock:
+            failed = [item.id for item in items if item.is_available == available]
+            if not failed:
+                for item in items:
+                    if available:
+                        item.return_item()
+                    else:
+                        item.borrow()
+                    self.__record(item)
+        return failed
+    
+    def update(self, item: LibraryItem) -> None:
+        """Object di list sudah berubah, cukup catat versi barunya"""
+        with self.__lock:
+            self.__record(item)
+    
+    def iter_items(self) -> Iterator[LibraryItem]:
+        """Iterasi list item"""
+        return iter(self.__items)
+    
+    def page(self, after: Optional[str], limit: int,
+             item_type: Optional[str] = None) -> List[LibraryItem]:
+        """Binary search pada SortedIndex, hanya item di halaman ini yang dibaca"""
+        with self.__lock:
+            if item_type is None:
+                index = self.__by_id
+            else:
+                index = self.__by_type.get(item_type)
+                if index is None:
+                    return []
+            items = index.page(after, limit)
+        self._count_scanned(len(items))
+        return items
+    
+    def count(self) -> int:
+        """Jumlah item dalam list"""
         return len(self.__items)
     
-    @property
-    def available_items(self) -> int:
-        """Getter untuk jumlah item tersedia"""
+    def count_available(self) -> int:
+        """Menghitung item tersedia"""
+        self._count_scanned(len(self.__items))
         return sum(1 for item in self.__items if item.is_available)
     
-    # ========== PUBLIC METHODS ==========
-    def add_item(self, item: LibraryItem) -> bool:
+    def count_by_type(self) -> Dict[str, int]:
+        """Menghitung item per kategori"""
+        type_count: Dict[str, int] = {}
+        self._count_scanned(len(self.__items))
+        for item in self.__items:
+            item_type = item.get_item_type()
+            type_count[item_type] = type_count.get(item_type, 0) + 1
+        return type_count
+    
+    # ========== MVCC ==========
+    def snapshot(self) -> "InMemorySnapshot":
         """
-        Menambahkan item ke perpustakaan
-        Menerapkan Polymorphism - bisa menerima berbagai tipe LibraryItem
-        
-        Args:
-            item: Object LibraryItem atau subclassnya
-            
-        Returns:
-            bool: True jika berhasil ditambahkan
+        Membuat snapshot point-in-time
+        Hanya butuh lock singkat untuk mencatat versi, pembacaan berjalan tanpa lock
         """
-        if not isinstance(item, LibraryItem):
-            raise TypeError("Item harus merupakan instance dari LibraryItem")
-        
-        # Cek duplikasi ID
-        if self.__find_item_by_id(item.id):
-            print(f"Error: Item dengan ID {item.id} sudah ada!")
-            return False
-        
-        self.__items.append(item)
-        return True
+        with self.__lock:
+            if self.__history is None:
+                self.__history = {
+                    item.id: ((0, ItemState.from_item(item)),) for item in self.__items
+                }
+            version = self.__version
+            self.__readers[version] = self.__readers.get(version, 0) + 1
+            size = len(self.__items)
+        return InMemorySnapshot(self, self.__items, self.__history, version, size)
+    
+    def _release_snapshot(self, version: int) -> None:
+        """Dipanggil oleh InMemorySnapshot.close()"""
+        with self.__lock:
+            self.__readers[version] -= 1
+            if not self.__readers[version]:
+                del self.__readers[version]
+    
+    def __index(self, items: List[LibraryItem]) -> None:
+        """Memasukkan item baru ke index terurut (lock harus sudah dipegang)"""
+        pairs = [(item.id, item) for item in items]
+        self.__by_id.insert_many(pairs)
+        per_type: Dict[str, List[tuple]] = {}
+        for pair in pairs:
+            per_type.setdefault(pair[1].get_item_type(), []).append(pair)
+        for item_type, type_pairs in per_type.items():
+            self.__by_type.setdefault(item_type, SortedIndex()).insert_many(type_pairs)
     
-    def display_all_items(self) -> None:
+    def __record(self, item: LibraryItem) -> None:
         """
-        Menampilkan semua item dalam perpustakaan
-        Menerapkan Polymorphism - memanggil display_info() yang berbeda untuk tiap subclass
+        Mencatat versi baru item (lock harus sudah dipegang)
+        Versi lama yang tidak mungkin dibaca snapshot aktif langsung dibuang
         """
-        if not self.__items:
-            print("\n📚 Perpustakaan masih kosong.")
+        if self.__history is None:
             return
-        
-        print(f"\n{'='*60}")
-        print(f"📚 {self.__name.upper()}")
-        print(f"{'='*60}")
-        print(f"Total Item: {self.total_items} | Tersedia: {self.available_items}")
-        print(f"{'='*60}\n")
-        
-        # Group by type
-        books = [item for item in self.__items if isinstance(item, Book)]
-        magazines = [item for item in self.__items if isinstance(item, Magazine)]
-        dvds = [item for item in self.__items if isinstance(item, DVD)]
-        
-        if books:
-            print("📖 BUKU:")
-            for book in books:
-                print(f"  {book}")
-        
-        if magazines:
-            print("\n📰 MAJALAH:")
-            for magazine in magazines:
-                print(f"  {magazine}")
-        
-        if dvds:
-            print("\n💿 DVD:")
-            for dvd in dvds:
-                print(f"  {dvd}")
-        
-        print(f"\n{'='*60}")
+        self.__version += 1
+        latest = ((self.__version, ItemState.from_item(item)),)
+        chain = self.__history.get(item.id, ())
+        if self.__readers:
+            # Simpan versi terbaru yang masih bisa dilihat snapshot tertua
+            oldest = min(self.__readers)
+            keep_from = 0
+            for index, (version, _) in enumerate(chain):
+                if version > oldest:
+                    break
+                keep_from = index
+            latest = chain[keep_from:] + latest
+        # Tuple baru diganti secara atomik, pembaca tetap memegang tuple lama
+        self.__history[item.id] = latest
+
+
+class InMemorySnapshot(StorageSnapshot):
+    """
+    Snapshot MVCC dari InMemoryStorage
     
-    def search_by_title(self, title: str) -> List[LibraryItem]:
+    Attributes:
+        version (int): Versi data yang dilihat snapshot ini
+    """
+    
+    def __init__(self, storage: InMemoryStorage, items: List[LibraryItem],
+                 history: Dict[str, tuple], version: int, size: int):
+        """Constructor InMemorySnapshot (dibuat oleh InMemoryStorage.snapshot)"""
+        self.__storage = storage
+        self.__items = items
+        self.__history = history
+        self.__size = size
+        self.version = version
+        self.__closed = False
+    
+    def iter_items(self) -> Iterator[ItemState]:
+        """Item yang sudah ada saat snapshot dibuat, dengan state pada versi snapshot"""
+        for index in range(self.__size):
+            state = self.__state_of(self.__items[index].id)
+            if state is not None:
+                yield state
+        self.__storage._count_scanned(self.__size)
+    
+    def page(self, after: Optional[str], limit: int,
+             item_type: Optional[str] = None) -> List[ItemState]:
         """
-        Mencari item berdasarkan judul (case-insensitive, partial match)
-        
-        Args:
-            title: Kata kunci judul
-            
-        Returns:
-            List item yang cocok
+        Halaman dibaca dari index terurut milik storage; item yang ditambahkan
+        setelah snapshot dibuat (belum punya versi <= versi snapshot) dilewati
         """
-        title_lower = title.lower()
-        results = [
-            item for item in self.__items 
-            if title_lower in item.title.lower()
-        ]
-        return results
+        states: List[ItemState] = []
+        while len(states) < limit:
+            items = self.__storage.page(after, limit - len(states), item_type)
+            if not items:
+                break
+            for item in items:
+                state = self.__state_of(item.id)
+                if state is not None:
+                    states.append(state)
+            after = items[-1].id
+        return states
     
-    def search_by_id(self, item_id: str) -> Optional[LibraryItem]:
+    def count(self) -> int:
+        """Jumlah item saat snapshot dibuat"""
+        return self.__size
+    
+    def __state_of(self, item_id: str) -> Optional[ItemState]:
+        """State item pada versi snapshot, None jika item belum ada saat itu"""
+        for version, state in reversed(self.__history.get(item_id, ())):
+            if version <= self.version:
+                return state
+        return None
+    
+    def close(self) -> None:
+        """Melepas snapshot agar versi lama bisa dibuang"""
+        if not self.__closed:
+            self.__closed = True
+            self.__storage._release_snapshot(self.version)
+
+
+class SQLiteStorage(StorageBackend):
+    """
+    Penyimpanan persisten menggunakan SQLite (built-in Python, file lokal)
+    Semua query memakai parameter (?) sehingga statement di-cache oleh sqlite3,
+    dan kolom id, title, author, year, item_type memiliki index.
+    
+    items_scanned dihitung dari row yang diperiksa SQLite: query lewat index
+    menambah jumlah row yang dibaca, query yang memindai seluruh tabel
+    (misalnya pencarian judul) menambah jumlah row di tabel.
+    
+    Setiap thread memakai koneksinya sendiri (threading.local), sehingga transaksi
+    satu thread tidak tercampur dengan transaksi thread lain; penulisan dari
+    beberapa thread diserialkan oleh lock database SQLite.
+    
+    Attributes:
+        __local (threading.local): Koneksi database milik tiap thread (private)
+        __connections (List[sqlite3.Connection]): Semua koneksi yang dibuka (private)
+        __lock (threading.Lock): Lock untuk daftar koneksi dan __rows (private)
+        __rows (int): Jumlah row di tabel items, diperbarui setiap insert (private)
+    """
+    
+    # Atribut tambahan tiap subclass, disimpan sebagai JSON di kolom extra
+    EXTRA_FIELDS = {
+        "Book": ("isbn", "pages", "publisher"),
+        "Magazine": ("issue_number", "month", "frequency"),
+        "DVD": ("duration", "genre", "director"),
+    }
+    
+    _SQL_INSERT = (
+        "INSERT OR IGNORE INTO items "
+        "(id, kind, item_type, title, title_lower, author, year, is_available, extra) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+    )
+    _SQL_COLUMNS = "id, kind, title, author, year, is_available, extra"
+    
+    # Setiap query membuat object baru dari row database
+    live_objects = False
+    
+    def __init__(self, path: str = "perpustakaan.db"):
         """
-        Mencari item berdasarkan ID
+        Constructor SQLiteStorage
         
         Args:
-            item_id: ID item
-            
-        Returns:
-            LibraryItem jika ditemukan, None jika tidak
+            path: Lokasi file database
+        
+        Raises:
+            ValueError: Jika path adalah database sementara (":memory:" atau "")
         """
-        return self.__find_item_by_id(item_id)
+        # Snapshot membuka koneksi kedua ke path yang sama; database sementara
+        # bersifat privat per koneksi, jadi snapshot tidak akan melihat datanya
+        if path in (":memory:", ""):
+            raise ValueError("SQLiteStorage butuh file database; gunakan InMemoryStorage "
+                             "untuk penyimpanan di memori")
+        super().__init__()
+        self.__path = path
+        self.__local = threading.local()
+        self.__connections: List[sqlite3.Connection] = []
+        self.__lock = threading.Lock()
+        with self.__conn:
+            self.__conn.execute(
+                "CREATE TABLE IF NOT EXISTS items ("
+                " seq INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " id TEXT NOT NULL UNIQUE,"
+                " kind TEXT NOT NULL,"
+                " item_type TEXT NOT NULL,"
+                " title TEXT NOT NULL,"
+                " title_lower TEXT NOT NULL,"
+                " author TEXT NOT NULL,"
+                " year INTEGER NOT NULL,"
+                " is_available INTEGER NOT NULL DEFAULT 1,"
+                " extra TEXT NOT NULL)"
+            )
+            self.__conn.execute("CREATE INDEX IF NOT EXISTS idx_items_title ON items(title_lower)")
+            self.__conn.execute("CREATE INDEX IF NOT EXISTS idx_items_author ON items(author)")
+            self.__conn.execute("CREATE INDEX IF NOT EXISTS idx_items_year ON items(year)")
+            self.__conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_items_type ON items(item_type, is_available)"
+            )
+            self.__conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_items_type_id ON items(item_type, id)"
+            )
+        self.__rows = self.__conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
     
-    def borrow_item(self, item_id: str) -> bool:
+    @property
+    def __conn(self) -> sqlite3.Connection:
+        """Koneksi milik thread yang sedang berjalan, dibuka saat pertama dipakai"""
+        conn = getattr(self.__local, "conn", None)
+        if conn is None:
+            # check_same_thread=False hanya agar close() bisa menutup koneksi
+            # milik thread lain; selama dipakai, koneksi tidak pernah dibagi
+            conn = sqlite3.connect(self.__path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with self.__lock:
+                self.__connections.append(conn)
+            self.__local.conn = conn
+        return conn
+    
+    def close(self) -> None:
+        """Menutup semua koneksi database (milik semua thread)"""
+        with self.__lock:
+            connections, self.__connections = self.__connections, []
+        for conn in connections:
+            conn.close()
+        self.__local = threading.local()
+    
+    # ========== KONVERSI ROW <-> OBJECT ==========
+    def __to_row(self, item: LibraryItem) -> tuple:
+        """Mengubah object item menjadi tuple untuk INSERT"""
+        kind = type(item).__name__
+        if kind not in self.EXTRA_FIELDS:
+            raise TypeError(f"Tipe item '{kind}' tidak didukung oleh SQLiteStorage")
+        extra = [getattr(item, field) for field in self.EXTRA_FIELDS[kind]]
+        return (item.id, kind, item.get_item_type(), item.title, item.title.lower(),
+                item.author, item.year, int(item.is_available), json.dumps(extra))
+    
+    def __to_item(self, row: tuple) -> LibraryItem:
+        """Mengubah row database kembali menjadi object subclass yang sesuai"""
+        item_id, kind, title, author, year, is_available, extra = row
+        item_class = {"Book": Book, "Magazine": Magazine, "DVD": DVD}[kind]
+        item = item_class(item_id, title, author, year, *json.loads(extra))
+        item._is_available = bool(is_available)
+        return item
+    
+    # ========== IMPLEMENTASI INTERFACE ==========
+    def add(self, item: LibraryItem) -> bool:
+        """Menyimpan satu item dalam satu transaksi"""
+        with self.__conn:
+            cursor = self.__conn.execute(self._SQL_INSERT, self.__to_row(item))
+        with self.__lock:
+            self.__rows += cursor.rowcount
+        return cursor.rowcount == 1
+    
+    def add_many(self, items: Iterable[LibraryItem]) -> List[LibraryItem]:
         """
-        Meminjam item dari perpustakaan
-        
-        Args:
-            item_id: ID item yang akan dipinjam
-            
-        Returns:
-            bool: True jika berhasil, False jika gagal
+        Menyimpan banyak item dalam satu transaksi
+        Statement INSERT yang sama dipakai ulang (prepared) untuk setiap item
         """
-        item = self.__find_item_by_id(item_id)
-        
-        if not item:
-            print(f"❌ Item dengan ID '{item_id}' tidak ditemukan.")
-            return False
-        
-        if item.borrow():
-            print(f"✅ Berhasil meminjam: {item.title}")
-            return True
-        else:
-            print(f"❌ Item '{item.title}' sedang dipinjam.")
+        added = []
+        with self.__conn:
+            for item in items:
+                cursor = self.__conn.execute(self._SQL_INSERT, self.__to_row(item))
+                if cursor.rowcount == 1:
+                    added.append(item)
+        with self.__lock:
+            self.__rows += len(added)
+        return added
+    
+    def get(self, item_id: str) -> Optional[LibraryItem]:
+        """Lookup berdasarkan ID memakai index UNIQUE"""
+        row = self.__conn.execute(
+            f"SELECT {self._SQL_COLUMNS} FROM items WHERE id = ?", (item_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        self._count_scanned(1)
+        return self.__to_item(row)
+    
+    def search_title(self, keyword: str) -> List[LibraryItem]:
+        """
+        Pencarian partial match dikerjakan langsung oleh SQLite
+        instr() tidak bisa memakai index, jadi seluruh tabel dipindai
+        """
+        rows = self.__conn.execute(
+            f"SELECT {self._SQL_COLUMNS} FROM items "
+            "WHERE instr(title_lower, ?) > 0 ORDER BY seq",
+            (keyword.lower(),)
+        )
+        self._count_scanned(self.__rows)
+        return [self.__to_item(row) for row in rows]
+    
+    def get_many(self, item_ids: Iterable[str]) -> Dict[str, LibraryItem]:
+        """Satu query IN (...) untuk semua ID"""
+        item_ids = list(set(item_ids))
+        if not item_ids:
+            return {}
+        placeholders = ", ".join("?" * len(item_ids))
+        rows = self.__conn.execute(
+            f"SELECT {self._SQL_COLUMNS} FROM items WHERE id IN ({placeholders})", item_ids
+        ).fetchall()
+        self._count_scanned(len(rows))
+        return {row[0]: self.__to_item(row) for row in rows}
+    
+    def set_available(self, item: LibraryItem, available: bool) -> bool:
+        """
+        Update bersyarat sehingga pengecekan dan perubahan status terjadi
+        dalam satu statement SQL
+        """
+        with self.__conn:
+            cursor = self.__conn.execute(
+                "UPDATE items SET is_available = ? WHERE id = ? AND is_available = ?",
+                (int(available), item.id, int(not available))
+            )
+        if cursor.rowcount != 1:
             return False
+        return item.return_item() if available else item.borrow()
     
-    def return_item(self, item_id: str) -> bool:
+    def set_available_many(self, items: List[LibraryItem], available: bool) -> List[str]:
         """
-        Mengembalikan item ke perpustakaan
+        Semua update bersyarat dijalankan dalam satu transaksi;
+        jika ada yang gagal (atau terjadi error) transaksi di-rollback
+        """
+        try:
+            cursor = self.__conn.executemany(
+                "UPDATE items SET is_available = ? WHERE id = ? AND is_available = ?",
+                [(int(available), item.id, int(not available)) for item in items]
+            )
+            if cursor.rowcount != len(items):
+                self.__conn.rollback()
+                placeholders = ", ".join("?" * len(items))
+                rows = self.__conn.execute(
+                    f"SELECT id FROM items WHERE is_available = ? AND id IN ({placeholders})",
+                    [int(available)] + [item.id for item in items]
+                )
+                failed = [row[0] for row in rows]
+                # Row yang bentrok bisa sudah berubah lagi setelah rollback;
+                # batch tetap gagal, jadi jangan pernah mengembalikan list kosong
+                return failed or [item.id for item in items]
+            self.__conn.commit()
+        except Exception:
+            self.__conn.rollback()
+            raise
+        
+        for item in items:
+            if available:
+                item.return_item()
+            else:
+                item.borrow()
+        return []
+    
+    def update(self, item: LibraryItem) -> None:
+        """
+        Menyimpan perubahan judul item
+        Status ketersediaan tidak ikut ditulis: object ini bisa saja salinan lama,
+        dan status hanya diubah oleh set_available/set_available_many
+        """
+        with self.__conn:
+            self.__conn.execute(
+                "UPDATE items SET title = ?, title_lower = ? WHERE id = ?",
+                (item.title, item.title.lower(), item.id)
+            )
+    
+    def iter_items(self) -> Iterator[LibraryItem]:
+        """Iterasi semua item secara bertahap (tidak dimuat sekaligus)"""
+        cursor = self.__conn.execute(f"SELECT {self._SQL_COLUMNS} FROM items ORDER BY seq")
+        for row in cursor:
+            self._count_scanned(1)
+            yield self.__to_item(row)
+    
+    def page(self, after: Optional[str], limit: int,
+             item_type: Optional[str] = None) -> List[LibraryItem]:
+        """
+        Keyset pagination (WHERE id > ? ORDER BY id LIMIT ?) memakai index
+        UNIQUE id atau index (item_type, id), tanpa OFFSET
+        """
+        conditions, params = [], []
+        if item_type is not None:
+            conditions.append("item_type = ?")
+            params.append(item_type)
+        if after is not None:
+            conditions.append("id > ?")
+            params.append(after)
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+        rows = self.__conn.execute(
+            f"SELECT {self._SQL_COLUMNS} FROM items {where}ORDER BY id LIMIT ?",
+            params + [limit]
+        ).fetchall()
+        self._count_scanned(len(rows))
+        return [self.__to_item(row) for row in rows]
+    
+    def count(self) -> int:
+        """COUNT(*) di database"""
+        return self.__conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+    
+    def count_available(self) -> int:
+        """COUNT item tersedia di database (memindai seluruh tabel)"""
+        self._count_scanned(self.__rows)
+        return self.__conn.execute(
+            "SELECT COUNT(*) FROM items WHERE is_available = 1"
+        ).fetchone()[0]
+    
+    def count_by_type(self) -> Dict[str, int]:
+        """GROUP BY kategori, urut berdasarkan kemunculan pertama (memindai seluruh tabel)"""
+        self._count_scanned(self.__rows)
+        rows = self.__conn.execute(
+            "SELECT item_type, COUNT(*) FROM items GROUP BY item_type ORDER BY MIN(seq)"
+        )
+        return {item_type: count for item_type, count in rows}
+    
+    def snapshot(self) -> "SQLiteSnapshot":
+        """
+        Snapshot memakai transaksi baca pada koneksi terpisah
+        Dengan mode WAL, SQLite menjamin pembaca melihat data yang konsisten
+        sementara koneksi utama tetap bisa menulis
+        """
+        return SQLiteSnapshot(self, self.__path)
+
+
+class SQLiteSnapshot(StorageSnapshot):
+    """
+    Snapshot dari SQLiteStorage berupa transaksi baca yang terbuka
+    
+    Attributes:
+        __conn (sqlite3.Connection): Koneksi khusus snapshot (private)
+    """
+    
+    def __init__(self, storage: SQLiteStorage, path: str):
+        """Constructor SQLiteSnapshot (dibuat oleh SQLiteStorage.snapshot)"""
+        self.__storage = storage
+        self.__conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.__conn.execute("BEGIN")
+        # Query pertama menentukan titik waktu snapshot
+        self.__size = self.__conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+    
+    def iter_items(self) -> Iterator[ItemState]:
+        """Iterasi item pada titik waktu snapshot"""
+        rows = self.__conn.execute(
+            "SELECT id, title, author, year, item_type, is_available FROM items ORDER BY seq"
+        )
+        for item_id, title, author, year, item_type, is_available in rows:
+            self.__storage._count_scanned(1)
+            yield ItemState(item_id, title, author, year, item_type, bool(is_available))
+    
+    def count(self) -> int:
+        """Jumlah item pada titik waktu snapshot"""
+        return self.__size
+    
+    def count_available(self) -> int:
+        """COUNT item tersedia di dalam transaksi snapshot"""
+        self.__storage._count_scanned(self.__size)
+        return self.__conn.execute(
+            "SELECT COUNT(*) FROM items WHERE is_available = 1"
+        ).fetchone()[0]
+    
+    def page(self, after: Optional[str], limit: int,
+             item_type: Optional[str] = None) -> List[ItemState]:
+        """Keyset pagination di dalam transaksi snapshot"""
+        conditions, params = [], []
+        if item_type is not None:
+            conditions.append("item_type = ?")
+            params.append(item_type)
+        if after is not None:
+            conditions.append("id > ?")
+            params.append(after)
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+        rows = self.__conn.execute(
+            "SELECT id, title, author, year, item_type, is_available FROM items "
+            f"{where}ORDER BY id LIMIT ?",
+            params + [limit]
+        ).fetchall()
+        self.__storage._count_scanned(len(rows))
+        return [ItemState(item_id, title, author, year, item_type, bool(is_available))
+                for item_id, title, author, year, item_type, is_available in rows]
+    
+    def count_by_type(self) -> Dict[str, int]:
+        """GROUP BY kategori di dalam transaksi snapshot"""
+        self.__storage._count_scanned(self.__size)
+        rows = self.__conn.execute(
+            "SELECT item_type, COUNT(*) FROM items GROUP BY item_type ORDER BY MIN(seq)"
+        )
+        return {item_type: count for item_type, count in rows}
+    
+    def close(self) -> None:
+        """Mengakhiri transaksi baca dan menutup koneksi"""
+        if self.__conn is not None:
+            self.__conn.execute("COMMIT")
+            self.__conn.close()
+            self.__conn = None
+
+
+# ==================== INSTRUMENTATION ====================
+class LatencyHistogram:
+    """
+    Histogram latency bergaya HDR (log-linear) dalam satuan nanodetik.
+    Setiap rentang pangkat dua dibagi menjadi 2^precision sub-bucket, sehingga
+    galat relatif nilai persentil paling besar 1/2^precision (12.5% untuk
+    precision 3) dengan jumlah bucket yang kecil dan tetap.
+    
+    Attributes:
+        _precision (int): Jumlah bit sub-bucket (protected)
+        _buckets (Dict[int, int]): Indeks bucket -> jumlah sampel (protected)
+    """
+    
+    def __init__(self, precision: int = 3):
+        """Constructor LatencyHistogram"""
+        self._precision = precision
+        self._sub_buckets = 1 << precision
+        self._buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns: Optional[int] = None
+        self.max_ns = 0
+    
+    def __bucket_index(self, value: int) -> int:
+        """Menghitung indeks bucket untuk sebuah nilai"""
+        if value < self._sub_buckets:
+            return value
+        shift = value.bit_length() - 1 - self._precision
+        return self._sub_buckets * (shift + 1) + (value >> shift) - self._sub_buckets
+    
+    def bucket_upper_bound(self, index: int) -> int:
+        """Nilai terbesar (inklusif) yang masuk ke bucket dengan indeks tersebut"""
+        if index < self._sub_buckets:
+            return index
+        shift = index // self._sub_buckets - 1
+        mantissa = index % self._sub_buckets + self._sub_buckets
+        return ((mantissa + 1) << shift) - 1
+    
+    def record(self, value_ns: int) -> None:
+        """Mencatat satu sampel latency"""
+        index = self.__bucket_index(value_ns)
+        self._buckets[index] = self._buckets.get(index, 0) + 1
+        self.count += 1
+        self.total_ns += value_ns
+        if self.min_ns is None or value_ns < self.min_ns:
+            self.min_ns = value_ns
+        if value_ns > self.max_ns:
+            self.max_ns = value_ns
+    
+    def percentile(self, p: float) -> int:
+        """
+        Nilai persentil ke-p (batas atas bucket, sesuai konvensi HDR)
+        
+        Args:
+            p: Persentil 0-100
+        """
+        if self.count == 0:
+            return 0
+        rank = max(1, -(-p * self.count // 100))
+        cumulative = 0
+        for index in sorted(self._buckets):
+            cumulative += self._buckets[index]
+            if cumulative >= rank:
+                return min(self.bucket_upper_bound(index), self.max_ns)
+        return self.max_ns
+    
+    def cumulative_buckets(self) -> List[tuple]:
+        """List (batas_atas_ns, jumlah_kumulatif) untuk bucket yang terisi"""
+        result = []
+        cumulative = 0
+        for index in sorted(self._buckets):
+            cumulative += self._buckets[index]
+            result.append((self.bucket_upper_bound(index), cumulative))
+        return result
+
+
+class Instrumentation:
+    """
+    Pencatat metrik operasi Library: jumlah pemanggilan, histogram latency,
+    dan jumlah item yang di-scan oleh storage.
+    Hanya aktif setelah Library.enable_instrumentation() dipanggil.
+    
+    Attributes:
+        __calls (Dict[str, int]): Jumlah pemanggilan per operasi (private)
+        __scanned (Dict[str, int]): Item yang di-scan per operasi (private)
+        __latency (Dict[str, LatencyHistogram]): Latency per operasi (private)
+        __lock (threading.Lock): Lock untuk pencatatan dan pembacaan metrik (private)
+    """
+    
+    def __init__(self):
+        """Constructor Instrumentation"""
+        self.__calls: Dict[str, int] = {}
+        self.__scanned: Dict[str, int] = {}
+        self.__latency: Dict[str, LatencyHistogram] = {}
+        self.__lock = threading.Lock()
+    
+    def record(self, operation: str, elapsed_ns: int, scanned: int) -> None:
+        """Mencatat satu pemanggilan operasi"""
+        with self.__lock:
+            self.__calls[operation] = self.__calls.get(operation, 0) + 1
+            self.__scanned[operation] = self.__scanned.get(operation, 0) + scanned
+            if operation not in self.__latency:
+                self.__latency[operation] = LatencyHistogram()
+            self.__latency[operation].record(elapsed_ns)
+    
+    def wrap(self, operation: str, method: Callable, storage: StorageBackend) -> Callable:
+        """
+        Membungkus method agar setiap pemanggilannya tercatat
+        
+        Args:
+            operation: Nama operasi
+            method: Bound method yang dibungkus
+            storage: Storage yang dipakai, untuk menghitung item yang di-scan
+        """
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            # Dihitung per thread agar scan dari operasi lain yang berjalan
+            # bersamaan tidak ikut tercatat di operasi ini
+            scanned_before = storage.thread_items_scanned
+            start = time.perf_counter_ns()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.record(operation, time.perf_counter_ns() - start,
+                            storage.thread_items_scanned - scanned_before)
+        return wrapper
+    
+    def snapshot(self) -> Dict[str, dict]:
+        """Ringkasan metrik per operasi dalam bentuk dictionary"""
+        result = {}
+        with self.__lock:
+            for operation, histogram in self.__latency.items():
+                result[operation] = {
+                    "calls": self.__calls[operation],
+                    "items_scanned": self.__scanned[operation],
+                    "latency_ns": {
+                        "min": histogram.min_ns,
+                        "max": histogram.max_ns,
+                        "mean": histogram.total_ns // histogram.count,
+                        "p50": histogram.percentile(50),
+                        "p90": histogram.percentile(90),
+                        "p99": histogram.percentile(99),
+                        "p999": histogram.percentile(99.9),
+                    },
+                }
+        return result
+    
+    def to_prometheus(self) -> str:
+        """Metrik dalam format teks Prometheus (exposition format)"""
+        with self.__lock:
+            return self.__format_prometheus()
+    
+    def __format_prometheus(self) -> str:
+        """Isi to_prometheus (lock harus sudah dipegang)"""
+        lines = [
+            "# HELP library_operation_calls_total Jumlah pemanggilan operasi Library",
+            "# TYPE library_operation_calls_total counter",
+        ]
+        for operation, calls in self.__calls.items():
+            lines.append(f'library_operation_calls_total{{operation="{operation}"}} {calls}')
+        
+        lines += [
+            "# HELP library_items_scanned_total Jumlah item yang di-scan storage",
+            "# TYPE library_items_scanned_total counter",
+        ]
+        for operation, scanned in self.__scanned.items():
+            lines.append(f'library_items_scanned_total{{operation="{operation}"}} {scanned}')
+        
+        lines += [
+            "# HELP library_operation_latency_seconds Latency operasi Library",
+            "# TYPE library_operation_latency_seconds histogram",
+        ]
+        for operation, histogram in self.__latency.items():
+            label = f'operation="{operation}"'
+            for upper_ns, cumulative in histogram.cumulative_buckets():
+                lines.append(
+                    f'library_operation_latency_seconds_bucket{{{label},le="{upper_ns / 1e9:.9g}"}} '
+                    f'{cumulative}'
+                )
+            lines.append(
+                f'library_operation_latency_seconds_bucket{{{label},le="+Inf"}} {histogram.count}'
+            )
+            lines.append(f'library_operation_latency_seconds_sum{{{label}}} {histogram.total_ns / 1e9:.9g}')
+            lines.append(f'library_operation_latency_seconds_count{{{label}}} {histogram.count}')
+        return "\n".join(lines) + "\n"
+    
+    def export_json(self, path: str) -> None:
+        """Menyimpan snapshot metrik ke file JSON"""
+        self.__write_file(path, json.dumps(self.snapshot(), indent=2))
+    
+    def export_prometheus(self, path: str) -> None:
+        """Menyimpan metrik ke file teks Prometheus (untuk textfile collector)"""
+        self.__write_file(path, self.to_prometheus())
+    
+    @staticmethod
+    def __write_file(path: str, content: str) -> None:
+        """Menulis file secara atomik agar pembaca tidak melihat file setengah jadi"""
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            file.write(content)
+        os.replace(temp_path, path)
+
+
+# ==================== QUERY CACHE ====================
+class QueryCache:
+    """
+    Cache hasil query dengan kebijakan LRU (Least Recently Used) dan kapasitas terbatas.
+    Menyimpan counter hit/miss/eviction untuk membantu menentukan ukuran cache.
+    
+    Attributes:
+        capacity (int): Jumlah entry maksimum, 0 berarti cache tidak aktif
+        __entries (OrderedDict): Key -> hasil query, urut dari yang paling lama dipakai (private)
+    """
+    
+    def __init__(self, capacity: int = 256):
+        """Constructor QueryCache"""
+        if capacity < 0:
+            raise ValueError("Kapasitas cache tidak boleh negatif")
+        self.capacity = capacity
+        self.__entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+    
+    def __len__(self) -> int:
+        return len(self.__entries)
+    
+    def lookup(self, key) -> tuple:
+        """
+        Mencari hasil query di cache
+        
+        Returns:
+            tuple: (ditemukan, nilai)
+        """
+        if key in self.__entries:
+            self.__entries.move_to_end(key)
+            self.hits += 1
+            return True, self.__entries[key]
+        self.misses += 1
+        return False, None
+    
+    def put(self, key, value) -> None:
+        """Menyimpan hasil query, membuang entry paling lama jika penuh"""
+        if self.capacity == 0:
+            return
+        self.__entries[key] = value
+        self.__entries.move_to_end(key)
+        if len(self.__entries) > self.capacity:
+            self.__entries.popitem(last=False)
+            self.evictions += 1
+    
+    def invalidate(self, key) -> None:
+        """Menghapus satu entry jika ada"""
+        if key in self.__entries:
+            del self.__entries[key]
+            self.invalidations += 1
+    
+    def invalidate_where(self, predicate: Callable) -> None:
+        """Menghapus semua entry yang key-nya memenuhi predicate"""
+        stale = [key for key in self.__entries if predicate(key)]
+        for key in stale:
+            del self.__entries[key]
+        self.invalidations += len(stale)
+    
+    def clear(self) -> None:
+        """Mengosongkan cache (counter tetap dipertahankan)"""
+        self.__entries.clear()
+    
+    def stats(self) -> Dict[str, int]:
+        """Statistik penggunaan cache"""
+        return {
+            "capacity": self.capacity,
+            "size": len(self.__entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+# ==================== CHANGE FEED ====================
+EVENT_ITEM_ADDED = "item_added"
+EVENT_ITEM_BORROWED = "item_borrowed"
+EVENT_ITEM_RETURNED = "item_returned"
+EVENT_TITLE_CHANGED = "title_changed"
+
+
+class LibraryEvent(NamedTuple):
+    """
+    Satu event perubahan pada Library
+    
+    Attributes:
+        seq (int): Nomor urut event, selalu naik (dimulai dari 1)
+        event_type (str): Salah satu konstanta EVENT_*
+        item_id (str): ID item yang berubah
+        timestamp (float): Waktu event (time.time())
+        data (dict): Detail event, misalnya title/old_title/new_title
+    """
+    seq: int
+    event_type: str
+    item_id: str
+    timestamp: float
+    data: dict
+
+
+class CursorExpiredError(Exception):
+    """
+    Cursor tertinggal terlalu jauh: event yang dibutuhkan sudah tertimpa
+    di ring buffer. Konsumen perlu sinkron ulang (baca ulang seluruh katalog).
+    """
+    pass
+
+
+class ChangeFeed:
+    """
+    Aliran event perubahan Library dengan backlog berupa ring buffer.
+    Publish dan baca per event berbiaya konstan; hanya `capacity` event
+    terakhir yang disimpan.
+    
+    Attributes:
+        capacity (int): Jumlah event maksimum di backlog
+        __buffer (list): Ring buffer event (private)
+        __next_seq (int): Nomor urut untuk event berikutnya (private)
+    """
+    
+    def __init__(self, capacity: int = 10_000):
+        """Constructor ChangeFeed"""
+        if capacity <= 0:
+            raise ValueError("Kapasitas feed harus lebih dari 0")
+        self.capacity = capacity
+        self.__buffer: List[Optional[LibraryEvent]] = [None] * capacity
+        self.__next_seq = 1
+        self.__lock = threading.Lock()
+    
+    @property
+    def last_seq(self) -> int:
+        """Nomor urut event terakhir (0 jika belum ada event)"""
+        return self.__next_seq - 1
+    
+    @property
+    def oldest_seq(self) -> int:
+        """Nomor urut event tertua yang masih ada di backlog"""
+        return max(1, self.__next_seq - self.capacity)
+    
+    def publish(self, event_type: str, item_id: str, **data) -> LibraryEvent:
+        """Menambahkan event baru ke feed"""
+        with self.__lock:
+            event = LibraryEvent(self.__next_seq, event_type, item_id, time.time(), data)
+            self.__buffer[event.seq % self.capacity] = event
+            self.__next_seq += 1
+        return event
+    
+    def read(self, after_seq: int, limit: int = 1000) -> List[LibraryEvent]:
+        """
+        Membaca event dengan seq > after_seq
+        
+        Args:
+            after_seq: Posisi terakhir yang sudah diproses konsumen
+            limit: Jumlah event maksimum yang dikembalikan
+            
+        Raises:
+            ValueError: Jika after_seq di luar rentang 0 sampai last_seq
+            CursorExpiredError: Jika sebagian event setelah after_seq sudah hilang
+        """
+        with self.__lock:
+            self.__check_position(after_seq)
+            if after_seq + 1 < self.oldest_seq:
+                raise CursorExpiredError(
+                    f"Event setelah seq {after_seq} sudah tidak ada di backlog "
+                    f"(tertua: {self.oldest_seq})"
+                )
+            end = min(self.__next_seq, after_seq + 1 + limit)
+            return [self.__buffer[seq % self.capacity] for seq in range(after_seq + 1, end)]
+    
+    def subscribe(self, from_seq: Optional[int] = None) -> "FeedCursor":
+        """
+        Membuat cursor untuk membaca feed
+        
+        Args:
+            from_seq: Posisi terakhir yang sudah diproses (untuk melanjutkan).
+                None berarti mulai dari event berikutnya saja.
+        
+        Raises:
+            ValueError: Jika from_seq di luar rentang 0 sampai last_seq
+        """
+        if from_seq is None:
+            return FeedCursor(self, self.last_seq)
+        with self.__lock:
+            self.__check_position(from_seq)
+        return FeedCursor(self, from_seq)
+    
+    def __check_position(self, seq: int) -> None:
+        """Posisi cursor harus di antara 0 dan last_seq (lock harus sudah dipegang)"""
+        if not 0 <= seq <= self.last_seq:
+            raise ValueError(f"Posisi feed {seq} di luar rentang 0-{self.last_seq}")
+
+
+class FeedCursor:
+    """
+    Cursor milik satu konsumen feed
+    Simpan `position` supaya konsumen bisa melanjutkan setelah restart
+    
+    Attributes:
+        position (int): Seq event terakhir yang sudah dibaca
+    """
+    
+    def __init__(self, feed: ChangeFeed, position: int):
+        """Constructor FeedCursor (dibuat oleh ChangeFeed.subscribe)"""
+        self.__feed = feed
+        self.position = position
+    
+    @property
+    def lag(self) -> int:
+        """Jumlah event yang belum dibaca"""
+        return self.__feed.last_seq - self.position
+    
+    def poll(self, limit: int = 1000) -> List[LibraryEvent]:
+        """Mengambil event berikutnya dan memajukan posisi cursor"""
+        events = self.__feed.read(self.position, limit)
+        if events:
+            self.position = events[-1].seq
+        return events
+
+
+# ==================== RECOMMENDATION ====================
+class CoBorrowIndex:
+    """
+    Index rekomendasi "peminjam item ini juga meminjam ..."
+    
+    Item yang dipinjam oleh peminjam yang sama dalam satu sesi dianggap
+    dipinjam bersama. Setiap kali item masuk ke sesi, hitungan pasangannya
+    dengan item lain di sesi tersebut langsung diperbarui, sehingga
+    rekomendasi tidak pernah perlu memindai riwayat peminjaman.
+    
+    Memori dibatasi: setiap item hanya menyimpan maksimal
+    top_k * candidate_factor kandidat tetangga. Jika sudah penuh, kandidat
+    dengan hitungan terkecil diganti oleh tetangga baru (algoritma Space-Saving),
+    sehingga tetangga yang sering dipinjam bersama tetap bertahan. Top-K tiap
+    item disimpan dan hanya dihitung ulang setelah kandidatnya berubah,
+    jadi lookup rekomendasi O(K).
+    
+    Attributes:
+        top_k (int): Jumlah rekomendasi maksimal per item
+        session_timeout (float): Sesi berakhir jika peminjam tidak meminjam lagi
+            selama sekian detik
+        __capacity (int): Maksimal kandidat tetangga per item (private)
+        __max_session_items (int): Item terakhir yang diingat per sesi (private)
+        __max_open_sessions (int): Maksimal sesi terbuka sekaligus (private)
+        __neighbors (Dict[str, Dict[str, int]]): ID item -> ID tetangga -> hitungan (private)
+        __top (Dict[str, List[tuple]]): Cache top-K per item (private)
+        __sessions (OrderedDict): ID peminjam -> [waktu terakhir, list ID item],
+            urut dari yang paling lama tidak aktif (private)
+        __lock (threading.Lock): Lock untuk perubahan index (private)
+    """
+    
+    def __init__(self, top_k: int = 10, candidate_factor: int = 4,
+                 session_timeout: float = 1800.0, max_session_items: int = 50,
+                 max_open_sessions: int = 100_000):
+        """
+        Constructor CoBorrowIndex
+        
+        Args:
+            top_k: Jumlah rekomendasi maksimal per item
+            candidate_factor: Kelipatan top_k untuk kapasitas kandidat per item
+            session_timeout: Batas waktu tidak aktif sebelum sesi ditutup (detik)
+            max_session_items: Item terakhir per sesi yang dipasangkan dengan item baru
+            max_open_sessions: Sesi terlama ditutup jika jumlah sesi terbuka melebihi ini
+        """
+        if top_k <= 0 or candidate_factor <= 0:
+            raise ValueError("top_k dan candidate_factor harus lebih dari 0")
+        self.top_k = top_k
+        self.session_timeout = session_timeout
+        self.__capacity = top_k * candidate_factor
+        self.__max_session_items = max_session_items
+        self.__max_open_sessions = max_open_sessions
+        self.__neighbors: Dict[str, Dict[str, int]] = {}
+        self.__top: Dict[str, List[tuple]] = {}
+        self.__sessions: OrderedDict = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__loans = 0
+        self.__pairs = 0
+    
+    def record(self, patron_id: str, item_id: str, timestamp: Optional[float] = None) -> None:
+        """
+        Mencatat satu peminjaman ke sesi milik peminjam
+        
+        Args:
+            patron_id: ID peminjam
+            item_id: ID item yang dipinjam
+            timestamp: Waktu peminjaman, default time.time()
+        """
+        now = time.time() if timestamp is None else timestamp
+        with self.__lock:
+            self.__expire_sessions(now)
+            session = self.__sessions.pop(patron_id, None)
+            if session is None or now - session[0] > self.session_timeout:
+                session = [now, []]
+            self.__sessions[patron_id] = session
+            session[0] = now
+            self.__add_to_session(session[1], item_id)
+    
+    def record_session(self, item_ids: Iterable[str], patron_id: Optional[str] = None,
+                       timestamp: Optional[float] = None) -> None:
+        """
+        Mencatat banyak item yang dipinjam bersama (misalnya satu borrow_many)
+        Tanpa patron_id, item hanya dipasangkan satu sama lain
+        
+        Args:
+            item_ids: ID item yang dipinjam
+            patron_id: ID peminjam, jika diisi item juga masuk ke sesi peminjam tsb
+            timestamp: Waktu peminjaman, default time.time()
+        """
+        if patron_id is not None:
+            for item_id in item_ids:
+                self.record(patron_id, item_id, timestamp)
+            return
+        with self.__lock:
+            session: List[str] = []
+            for item_id in item_ids:
+                self.__add_to_session(session, item_id)
+    
+    def recommend(self, item_id: str, limit: Optional[int] = None) -> List[Tuple[str, int]]:
+        """
+        Item yang paling sering dipinjam bersama item_id
+        
+        Args:
+            item_id: ID item acuan
+            limit: Jumlah rekomendasi, default top_k
+            
+        Returns:
+            List[Tuple[str, int]]: (ID item, jumlah dipinjam bersama), urut menurun
+        """
+        limit = self.top_k if limit is None else min(limit, self.top_k)
+        top = self.__top.get(item_id)
+        if top is None:
+            with self.__lock:
+                counts = self.__neighbors.get(item_id)
+                if not counts:
+                    return []
+                # Urutan kedua berdasarkan ID agar hasil deterministik
+                top = heapq.nsmallest(self.top_k, counts.items(),
+                                      key=lambda pair: (-pair[1], pair[0]))
+                self.__top[item_id] = top
+        return top[:limit]
+    
+    def stats(self) -> Dict[str, int]:
+        """Ukuran index dan jumlah data yang sudah dicatat"""
+        return {
+            "loans": self.__loans,
+            "pairs": self.__pairs,
+            "items": len(self.__neighbors),
+            "candidates": sum(len(counts) for counts in self.__neighbors.values()),
+            "max_candidates_per_item": self.__capacity,
+            "open_sessions": len(self.__sessions),
+        }
+    
+    def __add_to_session(self, session: List[str], item_id: str) -> None:
+        """Memasangkan item dengan item lain di sesi, lalu memasukkannya ke sesi"""
+        self.__loans += 1
+        if item_id in session:
+            return
+        for other_id in session:
+            self.__bump(item_id, other_id)
+            self.__bump(other_id, item_id)
+        self.__pairs += len(session)
+        session.append(item_id)
+        if len(session) > self.__max_session_items:
+            del session[0]
+    
+    def __bump(self, item_id: str, neighbor_id: str) -> None:
+        """Menambah hitungan pasangan satu arah (Space-Saving jika kandidat penuh)"""
+        counts = self.__neighbors.get(item_id)
+        if counts is None:
+            counts = self.__neighbors[item_id] = {}
+        if neighbor_id in counts:
+            counts[neighbor_id] += 1
+        elif len(counts) < self.__capacity:
+            counts[neighbor_id] = 1
+        else:
+            victim = min(counts, key=counts.__getitem__)
+            counts[neighbor_id] = counts.pop(victim) + 1
+        self.__top.pop(item_id, None)
+    
+    def __expire_sessions(self, now: float) -> None:
+        """Menutup sesi yang sudah tidak aktif atau melebihi batas jumlah sesi"""
+        while self.__sessions:
+            patron_id, (last_seen, _) = next(iter(self.__sessions.items()))
+            if (now - last_seen <= self.session_timeout
+                    and len(self.__sessions) <= self.__max_open_sessions):
+                break
+            del self.__sessions[patron_id]
+
+
+# ==================== BATCH RESULT ====================
+class BatchResult:
+    """
+    Hasil operasi batch (borrow_many / return_many)
+    Operasi batch bersifat all-or-nothing: jika ada satu ID yang gagal,
+    tidak ada item yang diubah dan errors berisi alasan kegagalan per ID.
+    
+    Attributes:
+        success (bool): True jika semua item berhasil diproses
+        items (List[LibraryItem]): Item yang diproses (kosong jika gagal)
+        errors (Dict[str, str]): ID -> alasan gagal
+            ("not_found", "duplicate", "unavailable", "not_borrowed")
+    """
+    
+    def __init__(self, success: bool, items: List[LibraryItem],
+                 errors: Dict[str, str]):
+        """Constructor BatchResult"""
+        self.success = success
+        self.items = items
+        self.errors = errors
+    
+    def __bool__(self) -> bool:
+        return self.success
+    
+    def __repr__(self) -> str:
+        return (f"BatchResult(success={self.success}, "
+                f"items={[item.id for item in self.items]}, errors={self.errors})")
+
+
+# ==================== LIBRARY CLASS ====================
+class Library:
+    """
+    Class untuk mengelola koleksi perpustakaan
+    Menerapkan Encapsulation untuk melindungi data koleksi
+    
+    Attributes:
+        __storage (StorageBackend): Tempat penyimpanan item (private)
+        __name (str): Nama perpustakaan (private)
+        __metrics (Instrumentation): Pencatat metrik, None jika tidak aktif (private)
+        __title_cache (QueryCache): Cache hasil search_by_title (private)
+        __id_cache (QueryCache): Cache hasil search_by_id (private)
+        __feed (ChangeFeed): Aliran event perubahan (private)
+        __recommendations (CoBorrowIndex): Index item yang sering dipinjam bersama (private)
+        __write_lock (threading.RLock): Lock perubahan data; perubahan di storage dan
+            publish event-nya terjadi di dalam lock yang sama, sehingga urutan seq
+            di feed sama dengan urutan perubahan (private)
+    """
+    
+    # Operasi yang dicatat ketika instrumentation diaktifkan
+    INSTRUMENTED_OPERATIONS = (
+        "add_item", "search_by_title", "search_by_id",
+        "borrow_item", "return_item", "borrow_many", "return_many",
+        "page", "recommend", "display_statistics",
+    )
+    
+    # Urutan dan ikon kategori pada display_all_items
+    DISPLAY_SECTIONS = (("Buku", "📖"), ("Majalah", "📰"), ("DVD", "💿"))
+    
+    def __init__(self, name: str = "Perpustakaan Digital",
+                 storage: Optional[StorageBackend] = None,
+                 cache_size: int = 256,
+                 feed_capacity: int = 10_000,
+                 recommendation_k: int = 10):
+        """
+        Constructor Library
+        Menggunakan private attributes untuk encapsulation
+        
+        Args:
+            name: Nama perpustakaan
+            storage: Backend penyimpanan, default InMemoryStorage (list di memori)
+            cache_size: Kapasitas cache hasil pencarian, 0 untuk menonaktifkan
+            feed_capacity: Jumlah event perubahan yang disimpan di backlog
+            recommendation_k: Jumlah rekomendasi "juga meminjam" yang disimpan per item
+        """
+        self.__storage = storage if storage is not None else InMemoryStorage()
+        self.__name = name
+        self.__metrics: Optional[Instrumentation] = None
+        self.__title_cache = QueryCache(cache_size)
+        self.__id_cache = QueryCache(cache_size)
+        self.__feed = ChangeFeed(feed_capacity)
+        self.__recommendations = CoBorrowIndex(recommendation_k)
+        self.__write_lock = threading.RLock()
+    
+    # ========== PROPERTY DECORATORS ==========
+    @property
+    def name(self) -> str:
+        """Getter untuk nama perpustakaan"""
+        return self.__name
+    
+    @property
+    def total_items(self) -> int:
+        """Getter untuk total item (computed property)"""
+        return self.__storage.count()
+    
+    @property
+    def available_items(self) -> int:
+        """Getter untuk jumlah item tersedia"""
+        return self.__storage.count_available()
+    
+    @property
+    def cache_stats(self) -> Dict[str, Dict[str, int]]:
+        """Getter untuk statistik cache pencarian (hit/miss/eviction)"""
+        return {
+            "search_by_title": self.__title_cache.stats(),
+            "search_by_id": self.__id_cache.stats(),
+        }
+    
+    @property
+    def changes(self) -> ChangeFeed:
+        """
+        Getter untuk aliran event perubahan (add, borrow, return, ganti judul)
+        Contoh: cursor = library.changes.subscribe(); events = cursor.poll()
+        """
+        return self.__feed
+    
+    @property
+    def recommendations(self) -> CoBorrowIndex:
+        """Getter untuk index rekomendasi item yang sering dipinjam bersama"""
+        return self.__recommendations
+    
+    @property
+    def metrics(self) -> Optional[Instrumentation]:
+        """Getter untuk instrumentation (None jika tidak aktif)"""
+        return self.__metrics
+    
+    # ========== INSTRUMENTATION ==========
+    def enable_instrumentation(self) -> Instrumentation:
+        """
+        Mengaktifkan pencatatan metrik untuk INSTRUMENTED_OPERATIONS
+        Method dibungkus per-instance, jadi saat tidak aktif tidak ada overhead sama sekali
+        
+        Returns:
+            Instrumentation: Object pencatat metrik
+        """
+        if self.__metrics is None:
+            self.__metrics = Instrumentation()
+            for operation in self.INSTRUMENTED_OPERATIONS:
+                method = getattr(self, operation)
+                setattr(self, operation, self.__metrics.wrap(operation, method, self.__storage))
+        return self.__metrics
+    
+    def disable_instrumentation(self) -> None:
+        """Menonaktifkan pencatatan metrik dan mengembalikan method asli"""
+        for operation in self.INSTRUMENTED_OPERATIONS:
+            self.__dict__.pop(operation, None)
+        self.__metrics = None
+    
+    # ========== PUBLIC METHODS ==========
+    def add_item(self, item: LibraryItem) -> bool:
+        """
+        Menambahkan item ke perpustakaan
+        Menerapkan Polymorphism - bisa menerima berbagai tipe LibraryItem
+        
+        Args:
+            item: Object LibraryItem atau subclassnya
+            
+        Returns:
+            bool: True jika berhasil ditambahkan
+        """
+        if not isinstance(item, LibraryItem):
+            raise TypeError("Item harus merupakan instance dari LibraryItem")
+        
+        # Cek duplikasi ID dilakukan oleh storage
+        with self.__write_lock:
+            added = self.__storage.add(item)
+            if added:
+                self.__on_item_added(item)
+        if not added:
+            print(f"Error: Item dengan ID {item.id} sudah ada!")
+        return added
+    
+    def add_items(self, items: Iterable[LibraryItem]) -> int:
+        """
+        Menambahkan banyak item sekaligus dalam satu batch
+        Item dengan ID yang sudah ada dilewati
+        
+        Args:
+            items: Kumpulan object LibraryItem
+            
+        Returns:
+            int: Jumlah item yang berhasil ditambahkan
+        """
+        items = list(items)
+        for item in items:
+            if not isinstance(item, LibraryItem):
+                raise TypeError("Item harus merupakan instance dari LibraryItem")
+        
+        with self.__write_lock:
+            added = self.__storage.add_many(items)
+            # Cache dibersihkan sekali untuk seluruh batch, bukan sekali per item
+            self.__invalidate_cache_many(added)
+            for item in added:
+                self.__on_item_added(item, invalidate_cache=False)
+        return len(added)
+    
+    def snapshot(self) -> StorageSnapshot:
+        """
+        Membuat snapshot read-only point-in-time dari koleksi
+        Cocok untuk laporan panjang: peminjaman/pengembalian tetap berjalan
+        dan tidak mempengaruhi isi snapshot
+        
+        Returns:
+            StorageSnapshot: Gunakan dengan `with library.snapshot() as view:`
+        """
+        return self.__storage.snapshot()
+    
+    def display_all_items(self, page_size: int = 500) -> None:
+        """
+        Menampilkan semua item dalam perpustakaan per kategori, urut berdasarkan ID
+        Data dibaca dari satu snapshot sehingga laporan konsisten dan tidak
+        menghalangi peminjaman. Item dibaca per halaman (keyset pagination),
+        sehingga memori yang dipakai hanya sebesar satu halaman
+        
+        Args:
+            page_size: Jumlah item yang dibaca dari snapshot sekaligus
+        """
+        with self.__storage.snapshot() as view:
+            total = view.count()
+            if not total:
+                print("\n📚 Perpustakaan masih kosong.")
+                return
+            
+            print(f"\n{'='*60}")
+            print(f"📚 {self.__name.upper()}")
+            print(f"{'='*60}")
+            print(f"Total Item: {total} | Tersedia: {view.count_available()}")
+            print(f"{'='*60}\n")
+            
+            for section, (item_type, icon) in enumerate(self.DISPLAY_SECTIONS):
+                for number, states in enumerate(view.iter_pages(page_size, item_type)):
+                    if number == 0:
+                        print(f"{chr(10) if section else ''}{icon} {item_type.upper()}:")
+                    for state in states:
+                        print(f"  {state}")
+        
+        print(f"\n{'='*60}")
+    
+    def page(self, page_size: int = 50, after: Optional[str] = None,
+             item_type: Optional[str] = None) -> ItemPage:
+        """
+        Mengambil satu halaman item urut berdasarkan ID (keyset pagination)
+        Halaman ke-N diambil langsung dari cursor halaman sebelumnya,
+        tanpa membaca ulang halaman-halaman sebelumnya
+        
+        Args:
+            page_size: Jumlah item per halaman
+            after: next_cursor dari halaman sebelumnya, None untuk halaman pertama
+            item_type: Hanya kategori tertentu ("Buku", "Majalah", "DVD"), None untuk semua
+            
+        Returns:
+            ItemPage: Item pada halaman ini dan cursor halaman berikutnya
+        """
+        if page_size <= 0:
+            raise ValueError("page_size harus lebih dari 0")
+        # Satu item tambahan untuk mengetahui apakah masih ada halaman berikutnya
+        items = self.__storage.page(after, page_size + 1, item_type)
+        for item in items[:page_size]:
+            self.__track(item)
+        if len(items) > page_size:
+            items = items[:page_size]
+            return ItemPage(items, items[-1].id)
+        return ItemPage(items, None)
+    
+    def iter_pages(self, page_size: int = 50, item_type: Optional[str] = None,
+                   after: Optional[str] = None) -> Iterator[ItemPage]:
+        """
+        Generator halaman item urut berdasarkan ID
+        Halaman berikutnya baru dibaca dari storage ketika diminta
+        
+        Args:
+            page_size: Jumlah item per halaman
+            item_type: Hanya kategori tertentu, None untuk semua
+            after: Cursor awal, None untuk mulai dari item pertama
+        """
+        while True:
+            page = self.page(page_size, after, item_type)
+            if page.items:
+                yield page
+            if page.next_cursor is None:
+                return
+            after = page.next_cursor
+    
+    def search_by_title(self, title: str) -> List[LibraryItem]:
+        """
+        Mencari item berdasarkan judul (case-insensitive, partial match)
+        
+        Args:
+            title: Kata kunci judul
+            
+        Returns:
+            List item yang cocok
+        """
+        keyword = title.lower()
+        found, results = self.__title_cache.lookup(keyword)
+        if not found:
+            results = self.__storage.search_title(title)
+            for item in results:
+                self.__track(item)
+            self.__title_cache.put(keyword, results)
+        return list(results)
+    
+    def search_by_id(self, item_id: str) -> Optional[LibraryItem]:
+        """
+        Mencari item berdasarkan ID
+        
+        Args:
+            item_id: ID item
+            
+        Returns:
+            LibraryItem jika ditemukan, None jika tidak
+        """
+        found, item = self.__id_cache.lookup(item_id)
+        if not found:
+            item = self.__find_item_by_id(item_id)
+            self.__id_cache.put(item_id, item)
+        return item
+    
+    def borrow_item(self, item_id: str, patron_id: Optional[str] = None) -> bool:
+        """
+        Meminjam item dari perpustakaan
+        
+        Args:
+            item_id: ID item yang akan dipinjam
+            patron_id: ID peminjam (opsional), dipakai untuk rekomendasi
+            
+        Returns:
+            bool: True jika berhasil, False jika gagal
+        """
+        item = self.__find_item_by_id(item_id)
+        
+        if not item:
+            print(f"❌ Item dengan ID '{item_id}' tidak ditemukan.")
+            return False
+        
+        if self.__set_available(item, False):
+            if patron_id is not None:
+                self.__recommendations.record(patron_id, item.id)
+            print(f"✅ Berhasil meminjam: {item.title}")
+            return True
+        else:
+            print(f"❌ Item '{item.title}' sedang dipinjam.")
+            return False
+    
+    def return_item(self, item_id: str) -> bool:
+        """
+        Mengembalikan item ke perpustakaan
         
         Args:
             item_id: ID item yang akan dikembalikan
@@ -488,31 +2218,85 @@ class Library:
             print(f"❌ Item dengan ID '{item_id}' tidak ditemukan.")
             return False
         
-        if item.return_item():
+        if self.__set_available(item, True):
             print(f"✅ Berhasil mengembalikan: {item.title}")
             return True
         else:
             print(f"❌ Item '{item.title}' tidak sedang dipinjam.")
             return False
     
+    def borrow_many(self, item_ids: Iterable[str], patron_id: Optional[str] = None) -> BatchResult:
+        """
+        Meminjam banyak item sekaligus (all-or-nothing)
+        Semua ID dicari dalam satu kali lookup ke storage, dan status diubah
+        secara atomik. Tidak mencetak pesan, hasil dikembalikan sebagai BatchResult.
+        Item yang berhasil dipinjam dicatat sebagai satu sesi peminjaman.
+        
+        Args:
+            item_ids: Kumpulan ID item yang akan dipinjam
+            patron_id: ID peminjam (opsional), dipakai untuk rekomendasi
+            
+        Returns:
+            BatchResult: Item yang dipinjam, atau alasan gagal per ID
+        """
+        result = self.__change_availability_many(item_ids, False)
+        if result:
+            self.__recommendations.record_session([item.id for item in result.items], patron_id)
+        return result
+    
+    def return_many(self, item_ids: Iterable[str]) -> BatchResult:
+        """
+        Mengembalikan banyak item sekaligus (all-or-nothing)
+        
+        Args:
+            item_ids: Kumpulan ID item yang akan dikembalikan
+            
+        Returns:
+            BatchResult: Item yang dikembalikan, atau alasan gagal per ID
+        """
+        return self.__change_availability_many(item_ids, True)
+    
+    def recommend(self, item_id: str, limit: int = 5) -> List[LibraryItem]:
+        """
+        Rekomendasi "peminjam item ini juga meminjam ..."
+        ID tetangga dibaca dari CoBorrowIndex (O(K)), bukan dari riwayat
+        peminjaman, lalu diambil dari storage dengan satu get_many
+        
+        Args:
+            item_id: ID item acuan
+            limit: Jumlah rekomendasi maksimal
+            
+        Returns:
+            List[LibraryItem]: Item yang paling sering dipinjam bersama item_id
+        """
+        neighbor_ids = [neighbor_id for neighbor_id, _ in
+                        self.__recommendations.recommend(item_id, limit)]
+        if not neighbor_ids:
+            return []
+        found = self.__storage.get_many(neighbor_ids)
+        items = [found[neighbor_id] for neighbor_id in neighbor_ids if neighbor_id in found]
+        for item in items:
+            self.__track(item)
+        return items
+    
     def display_statistics(self) -> None:
         """
         Menampilkan statistik perpustakaan
-        Menerapkan Polymorphism dengan memanggil get_item_type()
+        Semua angka diambil dari snapshot yang sama sehingga konsisten satu sama lain
         """
+        with self.__storage.snapshot() as view:
+            total = view.count()
+            available = view.count_available()
+            # Count by type
+            type_count = view.count_by_type()
+        
         print(f"\n{'='*60}")
         print("📊 STATISTIK PERPUSTAKAAN")
         print(f"{'='*60}")
         print(f"Nama Perpustakaan : {self.__name}")
-        print(f"Total Item        : {self.total_items}")
-        print(f"Item Tersedia     : {self.available_items}")
-        print(f"Item Dipinjam     : {self.total_items - self.available_items}")
-        
-        # Count by type
-        type_count = {}
-        for item in self.__items:
-            item_type = item.get_item_type()
-            type_count[item_type] = type_count.get(item_type, 0) + 1
+        print(f"Total Item        : {total}")
+        print(f"Item Tersedia     : {available}")
+        print(f"Item Dipinjam     : {total - available}")
         
         print(f"\nJumlah per Kategori:")
         for item_type, count in type_count.items():
@@ -526,10 +2310,407 @@ class Library:
         Private method untuk mencari item berdasarkan ID
         Menerapkan Encapsulation - hanya bisa diakses dari dalam class
         """
-        for item in self.__items:
-            if item.id == item_id:
-                return item
-        return None
+        item = self.__storage.get(item_id)
+        if item:
+            self.__track(item)
+        return item
+    
+    def __change_availability_many(self, item_ids: Iterable[str],
+                                   available: bool) -> BatchResult:
+        """Implementasi bersama borrow_many dan return_many"""
+        item_ids = list(item_ids)
+        found = self.__storage.get_many(item_ids)
+        
+        errors: Dict[str, str] = {}
+        seen = set()
+        for item_id in item_ids:
+            if item_id in seen:
+                errors[item_id] = "duplicate"
+            elif item_id not in found:
+                errors[item_id] = "not_found"
+            seen.add(item_id)
+        if errors:
+            return BatchResult(False, [], errors)
+        
+        items = [found[item_id] for item_id in item_ids]
+        with self.__write_lock:
+            failed = self.__storage.set_available_many(items, available)
+            if not failed:
+                for item in items:
+                    self.__track(item)
+                    self.__on_availability_changed(item)
+        if failed:
+            reason = "not_borrowed" if available else "unavailable"
+            return BatchResult(False, [], {item_id: reason for item_id in failed})
+        return BatchResult(True, items, {})
+    
+    def __set_available(self, item: LibraryItem, available: bool) -> bool:
+        """Mengubah status satu item dan mem-publish event-nya dalam satu lock"""
+        with self.__write_lock:
+            changed = self.__storage.set_available(item, available)
+            if changed:
+                self.__on_availability_changed(item)
+        return changed
+    
+    def __track(self, item: LibraryItem) -> None:
+        """Memantau perubahan data item agar storage tetap sinkron"""
+        item.add_listener(self.__on_item_changed)
+    
+    def __on_item_changed(self, item: LibraryItem, field: str, old_value) -> None:
+        """Callback dari LibraryItem ketika ada field yang berubah"""
+        with self.__write_lock:
+            self.__storage.update(item)
+            if field == "title":
+                self.__invalidate_cache(item, old_value)
+                self.__feed.publish(EVENT_TITLE_CHANGED, item.id,
+                                    old_title=old_value, new_title=item.title)
+    
+    def __on_item_added(self, item: LibraryItem, invalidate_cache: bool = True) -> None:
+        """Dipanggil setelah item baru tersimpan di storage (__write_lock dipegang)"""
+        self.__track(item)
+        if invalidate_cache:
+            self.__invalidate_cache(item)
+        self.__feed.publish(EVENT_ITEM_ADDED, item.id,
+                            title=item.title, item_type=item.get_item_type())
+    
+    def __on_availability_changed(self, item: LibraryItem) -> None:
+        """
+        Dipanggil setelah item dipinjam/dikembalikan (__write_lock dipegang)
+        Hasil cache hanya perlu dibuang jika storage mengembalikan salinan object
+        """
+        if not self.__storage.live_objects:
+            self.__invalidate_cache(item)
+        event_type = EVENT_ITEM_RETURNED if item.is_available else EVENT_ITEM_BORROWED
+        self.__feed.publish(event_type, item.id, title=item.title)
+    
+    def __invalidate_cache(self, item: LibraryItem, old_title: Optional[str] = None) -> None:
+        """
+        Membuang hasil cache yang bisa terpengaruh oleh perubahan item:
+        pencarian judul yang keyword-nya cocok dengan judul lama/baru, dan pencarian ID item tsb
+        """
+        titles = [item.title.lower()]
+        if old_title:
+            titles.append(old_title.lower())
+        self.__title_cache.invalidate_where(
+            lambda keyword: any(keyword in title for title in titles)
+        )
+        self.__id_cache.invalidate(item.id)
+    
+    def __invalidate_cache_many(self, items: List[LibraryItem]) -> None:
+        """
+        Seperti __invalidate_cache untuk banyak item baru sekaligus
+        Semua judul digabung menjadi satu string (dipisah NUL), sehingga setiap
+        keyword di cache cukup dicek sekali terhadap seluruh batch
+        """
+        if not items:
+            return
+        titles = "\0".join(item.title.lower() for item in items)
+        self.__title_cache.invalidate_where(
+            lambda keyword: "\0" in keyword or keyword in titles
+        )
+        for item in items:
+            self.__id_cache.invalidate(item.id)
+
+
+# ==================== SHARDED LIBRARY ====================
+def _shard_worker(conn, name: str, storage_path: Optional[str]) -> None:
+    """
+    Proses worker untuk satu shard
+    Menerima perintah (operasi, argumen) dari pipe dan mengirim balik hasilnya
+    """
+    storage = SQLiteStorage(storage_path) if storage_path else None
+    library = Library(name, storage)
+    
+    def change(item_id: str, available: bool) -> tuple:
+        item = library.search_by_id(item_id)
+        if item is None:
+            return "not_found", None
+        if available:
+            result = library.return_many([item_id])
+        else:
+            result = library.borrow_many([item_id])
+        return ("ok" if result else "failed"), library.search_by_id(item_id)
+    
+    def statistics() -> tuple:
+        with library.snapshot() as view:
+            return view.count(), view.count_available(), view.count_by_type()
+    
+    operations: Dict[str, Callable] = {
+        "add_items": library.add_items,
+        "search_by_id": library.search_by_id,
+        "search_by_title": library.search_by_title,
+        "page": lambda after, limit, item_type: library.page(limit, after, item_type).items,
+        "borrow": lambda item_id: change(item_id, False),
+        "return": lambda item_id: change(item_id, True),
+        "statistics": statistics,
+    }
+    
+    while True:
+        operation, args = conn.recv()
+        if operation == "stop":
+            break
+        try:
+            conn.send((True, operations[operation](*args)))
+        except Exception as error:  # dikirim ke coordinator dan di-raise di sana
+            conn.send((False, error))
+    conn.close()
+
+
+class ShardedLibrary:
+    """
+    Library yang dipecah ke beberapa proses worker (shard) berdasarkan hash ID item,
+    sehingga pekerjaan bisa berjalan paralel di beberapa core CPU.
+    
+    Coordinator (object ini) meneruskan search_by_id, borrow_item, dan return_item
+    ke satu shard, sedangkan search_by_title dan display_statistics dikirim ke semua
+    shard secara paralel lalu hasilnya digabung.
+    
+    Attributes:
+        __name (str): Nama perpustakaan (private)
+        __pipes (List[Connection]): Pipe ke setiap worker (private)
+        __locks (List[threading.Lock]): Lock per shard, satu request per pipe (private)
+        __workers (List[multiprocessing.Process]): Proses worker (private)
+    """
+    
+    def __init__(self, name: str = "Perpustakaan Digital", shards: Optional[int] = None,
+                 storage_path: Optional[str] = None):
+        """
+        Constructor ShardedLibrary, menjalankan satu proses per shard
+        
+        Args:
+            name: Nama perpustakaan
+            shards: Jumlah shard, default jumlah core CPU
+            storage_path: Jika diisi, setiap shard memakai SQLiteStorage di
+                file "<storage_path>.shard<N>"; jika tidak, InMemoryStorage
+        """
+        self.__name = name
+        self.__pipes = []
+        self.__locks = []
+        self.__workers = []
+        for index in range(shards or os.cpu_count() or 1):
+            parent_conn, child_conn = multiprocessing.Pipe()
+            path = f"{storage_path}.shard{index}" if storage_path else None
+            worker = multiprocessing.Process(
+                target=_shard_worker, args=(child_conn, f"{name} #{index}", path), daemon=True
+            )
+            worker.start()
+            child_conn.close()
+            self.__pipes.append(parent_conn)
+            self.__locks.append(threading.Lock())
+            self.__workers.append(worker)
+    
+    # ========== PROPERTY DECORATORS ==========
+    @property
+    def name(self) -> str:
+        """Getter untuk nama perpustakaan"""
+        return self.__name
+    
+    @property
+    def shard_count(self) -> int:
+        """Getter untuk jumlah shard"""
+        return len(self.__pipes)
+    
+    @property
+    def total_items(self) -> int:
+        """Total item di semua shard"""
+        return sum(total for total, _, _ in self.__broadcast("statistics"))
+    
+    @property
+    def available_items(self) -> int:
+        """Jumlah item tersedia di semua shard"""
+        return sum(available for _, available, _ in self.__broadcast("statistics"))
+    
+    # ========== PUBLIC METHODS ==========
+    def shard_of(self, item_id: str) -> int:
+        """
+        Menentukan shard untuk sebuah ID
+        Memakai CRC32 (bukan hash()) agar hasilnya sama di setiap proses dan run
+        """
+        return zlib.crc32(item_id.encode("utf-8")) % len(self.__pipes)
+    
+    def add_item(self, item: LibraryItem) -> bool:
+        """
+        Menambahkan item ke shard yang sesuai dengan ID-nya
+        
+        Returns:
+            bool: True jika berhasil ditambahkan
+        """
+        if not isinstance(item, LibraryItem):
+            raise TypeError("Item harus merupakan instance dari LibraryItem")
+        if not self.__call(self.shard_of(item.id), "add_items", [item]):
+            print(f"Error: Item dengan ID {item.id} sudah ada!")
+            return False
+        return True
+    
+    def add_items(self, items: Iterable[LibraryItem]) -> int:
+        """
+        Menambahkan banyak item, dipartisi per shard dan dikirim paralel
+        
+        Returns:
+            int: Jumlah item yang berhasil ditambahkan
+        """
+        partitions: List[List[LibraryItem]] = [[] for _ in self.__pipes]
+        for item in items:
+            if not isinstance(item, LibraryItem):
+                raise TypeError("Item harus merupakan instance dari LibraryItem")
+            partitions[self.shard_of(item.id)].append(item)
+        return sum(self.__broadcast(
+            "add_items", per_shard_args=[(partition,) for partition in partitions]
+        ))
+    
+    def search_by_id(self, item_id: str) -> Optional[LibraryItem]:
+        """Mencari item berdasarkan ID (hanya ke satu shard)"""
+        return self.__call(self.shard_of(item_id), "search_by_id", item_id)
+    
+    def search_by_title(self, title: str) -> List[LibraryItem]:
+        """
+        Mencari item berdasarkan judul di semua shard secara paralel
+        Hasil digabung dan diurutkan berdasarkan ID
+        """
+        results = []
+        for shard_results in self.__broadcast("search_by_title", (title,)):
+            results.extend(shard_results)
+        results.sort(key=lambda item: item.id)
+        return results
+    
+    def page(self, page_size: int = 50, after: Optional[str] = None,
+             item_type: Optional[str] = None) -> ItemPage:
+        """
+        Mengambil satu halaman item urut berdasarkan ID dari semua shard
+        Setiap shard mengirim halaman miliknya sendiri, lalu hasilnya
+        digabung (k-way merge) dan dipotong sesuai page_size
+        """
+        if page_size <= 0:
+            raise ValueError("page_size harus lebih dari 0")
+        shard_pages = self.__broadcast("page", (after, page_size + 1, item_type))
+        items = list(islice(heapq.merge(*shard_pages, key=lambda item: item.id), page_size + 1))
+        if len(items) > page_size:
+            items = items[:page_size]
+            return ItemPage(items, items[-1].id)
+        return ItemPage(items, None)
+    
+    def iter_pages(self, page_size: int = 50, item_type: Optional[str] = None,
+                   after: Optional[str] = None) -> Iterator[ItemPage]:
+        """Generator halaman item urut berdasarkan ID dari semua shard"""
+        while True:
+            page = self.page(page_size, after, item_type)
+            if page.items:
+                yield page
+            if page.next_cursor is None:
+                return
+            after = page.next_cursor
+    
+    def borrow_item(self, item_id: str) -> bool:
+        """
+        Meminjam item (hanya ke satu shard)
+        
+        Returns:
+            bool: True jika berhasil, False jika gagal
+        """
+        status, item = self.__call(self.shard_of(item_id), "borrow", item_id)
+        if status == "not_found":
+            print(f"❌ Item dengan ID '{item_id}' tidak ditemukan.")
+            return False
+        if status == "ok":
+            print(f"✅ Berhasil meminjam: {item.title}")
+            return True
+        print(f"❌ Item '{item.title}' sedang dipinjam.")
+        return False
+    
+    def return_item(self, item_id: str) -> bool:
+        """
+        Mengembalikan item (hanya ke satu shard)
+        
+        Returns:
+            bool: True jika berhasil, False jika gagal
+        """
+        status, item = self.__call(self.shard_of(item_id), "return", item_id)
+        if status == "not_found":
+            print(f"❌ Item dengan ID '{item_id}' tidak ditemukan.")
+            return False
+        if status == "ok":
+            print(f"✅ Berhasil mengembalikan: {item.title}")
+            return True
+        print(f"❌ Item '{item.title}' tidak sedang dipinjam.")
+        return False
+    
+    def display_statistics(self) -> None:
+        """Menampilkan statistik gabungan dari semua shard"""
+        total = available = 0
+        type_count: Dict[str, int] = {}
+        for shard_total, shard_available, shard_types in self.__broadcast("statistics"):
+            total += shard_total
+            available += shard_available
+            for item_type, count in shard_types.items():
+                type_count[item_type] = type_count.get(item_type, 0) + count
+        
+        print(f"\n{'='*60}")
+        print("📊 STATISTIK PERPUSTAKAAN")
+        print(f"{'='*60}")
+        print(f"Nama Perpustakaan : {self.__name}")
+        print(f"Jumlah Shard      : {self.shard_count}")
+        print(f"Total Item        : {total}")
+        print(f"Item Tersedia     : {available}")
+        print(f"Item Dipinjam     : {total - available}")
+        
+        print(f"\nJumlah per Kategori:")
+        for item_type, count in type_count.items():
+            print(f"  - {item_type}: {count}")
+        
+        print(f"{'='*60}")
+    
+    def close(self) -> None:
+        """Menghentikan semua proses worker"""
+        for pipe, lock in zip(self.__pipes, self.__locks):
+            with lock:
+                pipe.send(("stop", ()))
+                pipe.close()
+        for worker in self.__workers:
+            worker.join()
+        self.__pipes = []
+    
+    def __enter__(self) -> "ShardedLibrary":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    # ========== PRIVATE METHODS ==========
+    @staticmethod
+    def __unwrap(reply: tuple):
+        """Mengembalikan hasil dari worker, atau me-raise exception dari worker"""
+        ok, payload = reply
+        if not ok:
+            raise payload
+        return payload
+    
+    def __call(self, shard: int, operation: str, *args):
+        """Mengirim satu request ke satu shard dan menunggu hasilnya"""
+        with self.__locks[shard]:
+            self.__pipes[shard].send((operation, args))
+            return self.__unwrap(self.__pipes[shard].recv())
+    
+    def __broadcast(self, operation: str, args: tuple = (),
+                    per_shard_args: Optional[List[tuple]] = None) -> list:
+        """
+        Mengirim request ke semua shard sekaligus lalu mengumpulkan hasilnya,
+        sehingga semua shard bekerja paralel
+        
+        Args:
+            operation: Nama operasi
+            args: Argumen yang sama untuk semua shard
+            per_shard_args: Argumen berbeda untuk tiap shard (menggantikan args)
+        """
+        for lock in self.__locks:
+            lock.acquire()
+        try:
+            for index, pipe in enumerate(self.__pipes):
+                pipe.send((operation, per_shard_args[index] if per_shard_args else args))
+            replies = [pipe.recv() for pipe in self.__pipes]
+        finally:
+            for lock in self.__locks:
+                lock.release()
+        return [self.__unwrap(reply) for reply in replies]
 
 
 # ==================== MAIN PROGRAM ====================
@@ -605,7 +2786,13 @@ def main():
         
         elif pilihan == "4":
             item_id = input("Masukkan ID item yang akan dipinjam: ").strip()
-            library.borrow_item(item_id)
+            patron_id = input("Masukkan ID peminjam (opsional): ").strip() or None
+            if library.borrow_item(item_id, patron_id):
+                recommendations = library.recommend(item_id, 3)
+                if recommendations:
+                    print("\n💡 Peminjam item ini juga meminjam:")
+                    for item in recommendations:
+                        print(f"  {item}")
         
         elif pilihan == "5":
             item_id = input("Masukkan ID item yang akan dikembalikan: ").strip()
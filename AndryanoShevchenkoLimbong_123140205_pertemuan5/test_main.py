@@ -0,0 +1,244 @@
+"""
+Pengujian Sistem Manajemen Perpustakaan
+Menjalankan: python -m unittest test_main (dari folder pertemuan5)
+"""
+
+import os
+import random
+import shutil
+import tempfile
+import threading
+import unittest
+
+from main import (Book, ChangeFeed, CursorExpiredError, EVENT_ITEM_BORROWED, EVENT_TITLE_CHANGED,
+                  InMemoryStorage, Library, SQLiteStorage)
+
+# Jumlah thread dan iterasi pada pengujian konkuren
+JUMLAH_THREAD = 4
+ITERASI_PER_THREAD = 300
+
+
+def buat_buku(banyak):
+    """
+    Membuat sejumlah Book sintetis dengan ID B000, B001, ...
+
+    Args:
+        banyak (int): Jumlah buku
+
+    Returns:
+        list: Daftar Book
+    """
+    return [Book(f"B{i:03d}", f"Judul {i}", "Penulis", 2024, f"isbn-{i}", 100, "Penerbit")
+            for i in range(banyak)]
+
+
+def jalankan_konkuren(target):
+    """
+    Menjalankan target(nomor_thread) di JUMLAH_THREAD thread sekaligus
+
+    Returns:
+        list: Exception yang terjadi di thread mana pun
+    """
+    errors = []
+    mulai = threading.Barrier(JUMLAH_THREAD)
+
+    def worker(nomor):
+        try:
+            mulai.wait()
+            target(nomor)
+        except Exception as error:  # dikumpulkan lalu dicek di thread utama
+            errors.append(error)
+
+    threads = [threading.Thread(target=worker, args=(nomor,)) for nomor in range(JUMLAH_THREAD)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return errors
+
+
+class TestBatchKonkuren(unittest.TestCase):
+    """borrow_many/return_many tetap all-or-nothing ketika dipanggil dari banyak thread"""
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.storages = []
+
+    def tearDown(self):
+        for storage in self.storages:
+            storage.close()
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def buat_sqlite(self):
+        """SQLiteStorage baru di folder sementara"""
+        storage = SQLiteStorage(os.path.join(self.folder, f"db{len(self.storages)}.db"))
+        self.storages.append(storage)
+        return storage
+
+    def uji_batch_konkuren(self, storage):
+        """Batch yang berhasil dipinjam harus bisa dikembalikan oleh thread yang sama"""
+        library = Library("Uji", storage)
+        library.add_items(buat_buku(12))
+        ids = [f"B{i:03d}" for i in range(12)]
+        pelanggaran = []
+
+        def target(nomor):
+            acak = random.Random(nomor)
+            for _ in range(ITERASI_PER_THREAD):
+                batch = acak.sample(ids, 3)
+                if library.borrow_many(batch):
+                    result = library.return_many(batch)
+                    if not result:
+                        pelanggaran.append((batch, result.errors))
+
+        errors = jalankan_konkuren(target)
+        self.assertEqual(errors, [])
+        self.assertEqual(pelanggaran, [])
+        self.assertEqual(library.available_items, len(ids))
+
+    def test_batch_konkuren_sqlite(self):
+        """SQLiteStorage: transaksi satu thread tidak di-rollback oleh thread lain"""
+        self.uji_batch_konkuren(self.buat_sqlite())
+
+    def test_batch_konkuren_memori(self):
+        """InMemoryStorage: perilaku yang sama dengan SQLiteStorage"""
+        self.uji_batch_konkuren(InMemoryStorage())
+
+    def uji_urutan_feed(self, storage):
+        """Replay feed per item harus selalu bergantian dipinjam/dikembalikan"""
+        library = Library("Uji", storage, feed_capacity=100_000)
+        library.add_items(buat_buku(2))
+        ids = ["B000", "B001"]
+        cursor = library.changes.subscribe()
+
+        def target(nomor):
+            acak = random.Random(nomor)
+            for _ in range(ITERASI_PER_THREAD):
+                batch = acak.sample(ids, acak.randint(1, 2))
+                if library.borrow_many(batch):
+                    library.return_many(batch)
+
+        self.assertEqual(jalankan_konkuren(target), [])
+        tersedia = dict.fromkeys(ids, True)
+        for event in cursor.poll(limit=100_000):
+            dipinjam = event.event_type == EVENT_ITEM_BORROWED
+            self.assertEqual(tersedia[event.item_id], dipinjam,
+                             f"seq {event.seq}: {event.event_type} untuk {event.item_id}")
+            tersedia[event.item_id] = not dipinjam
+        self.assertEqual(cursor.lag, 0)
+
+    def test_urutan_feed_sqlite(self):
+        """SQLiteStorage: urutan seq di feed sama dengan urutan perubahan status"""
+        self.uji_urutan_feed(self.buat_sqlite())
+
+    def test_urutan_feed_memori(self):
+        """InMemoryStorage: urutan seq di feed sama dengan urutan perubahan status"""
+        self.uji_urutan_feed(InMemoryStorage())
+
+    def test_sqlite_tutup_semua_koneksi(self):
+        """close() menutup koneksi yang dibuka oleh thread lain"""
+        storage = self.buat_sqlite()
+        library = Library("Uji", storage)
+        library.add_items(buat_buku(4))
+        self.assertEqual(jalankan_konkuren(lambda nomor: storage.get("B000")), [])
+        storage.close()
+        storage.close()
+
+
+class TestPerubahanJudul(unittest.TestCase):
+    """Mengganti judul item yang didapat dari Library selalu tersimpan ke storage"""
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.storage = SQLiteStorage(os.path.join(self.folder, "db.db"))
+        self.library = Library("Uji", self.storage)
+        self.library.add_items(buat_buku(10))
+
+    def tearDown(self):
+        self.storage.close()
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def ganti_judul(self, item):
+        """Mengganti judul item lalu memastikan storage, cache, dan feed ikut berubah"""
+        cursor = self.library.changes.subscribe()
+        self.library.search_by_id(item.id)
+        self.library.search_by_title("diganti")
+
+        item.title = "Judul Diganti"
+
+        self.assertEqual(self.storage.get(item.id).title, "Judul Diganti")
+        self.assertEqual(self.library.search_by_id(item.id).title, "Judul Diganti")
+        self.assertEqual([found.id for found in self.library.search_by_title("diganti")],
+                         [item.id])
+        self.assertEqual([event.event_type for event in cursor.poll()], [EVENT_TITLE_CHANGED])
+
+    def test_judul_item_dari_page(self):
+        """Item dari page() dipantau"""
+        self.ganti_judul(self.library.page(3).items[1])
+
+    def test_judul_item_dari_iter_pages(self):
+        """Item dari iter_pages() dipantau"""
+        pages = list(self.library.iter_pages(4))
+        self.ganti_judul(pages[-1].items[-1])
+
+    def test_judul_item_dari_recommend(self):
+        """Item dari recommend() dipantau"""
+        self.library.borrow_many(["B001", "B002"], patron_id="P1")
+        self.ganti_judul(self.library.recommend("B001")[0])
+
+
+class TestInstrumentation(unittest.TestCase):
+    """Metrik tetap akurat ketika operasi berjalan bersamaan di banyak thread"""
+
+    def test_scan_dihitung_per_operasi(self):
+        """Scan search_by_title tidak tercatat di search_by_id yang berjalan bersamaan"""
+        library = Library("Uji", cache_size=0)
+        library.add_items(buat_buku(200))
+        metrics = library.enable_instrumentation()
+
+        def target(nomor):
+            for _ in range(ITERASI_PER_THREAD):
+                if nomor % 2:
+                    library.search_by_title("judul")
+                else:
+                    library.search_by_id("B001")
+
+        self.assertEqual(jalankan_konkuren(target), [])
+        ringkasan = metrics.snapshot()
+        jumlah_panggilan = JUMLAH_THREAD // 2 * ITERASI_PER_THREAD
+        self.assertEqual(ringkasan["search_by_title"]["calls"], jumlah_panggilan)
+        self.assertEqual(ringkasan["search_by_id"]["calls"], jumlah_panggilan)
+        self.assertEqual(ringkasan["search_by_title"]["items_scanned"], 200 * jumlah_panggilan)
+        self.assertEqual(ringkasan["search_by_id"]["items_scanned"], jumlah_panggilan)
+
+
+class TestChangeFeed(unittest.TestCase):
+    """Validasi posisi cursor ChangeFeed"""
+
+    def setUp(self):
+        self.feed = ChangeFeed(capacity=3)
+        for nomor in range(5):
+            self.feed.publish(EVENT_ITEM_BORROWED, f"B{nomor:03d}")
+
+    def test_posisi_di_luar_rentang(self):
+        """Posisi negatif atau setelah last_seq ditolak dengan ValueError"""
+        for posisi in (-1, self.feed.last_seq + 1):
+            with self.subTest(posisi=posisi):
+                with self.assertRaises(ValueError):
+                    self.feed.read(posisi)
+                with self.assertRaises(ValueError):
+                    self.feed.subscribe(posisi)
+
+    def test_posisi_di_dalam_rentang(self):
+        """Posisi valid tetap dibaca normal, posisi yang tertimpa tetap kedaluwarsa"""
+        self.assertEqual(self.feed.read(self.feed.last_seq), [])
+        self.assertEqual([event.seq for event in self.feed.read(2)], [3, 4, 5])
+        cursor = self.feed.subscribe(3)
+        self.assertEqual(cursor.lag, 2)
+        self.assertEqual([event.seq for event in cursor.poll()], [4, 5])
+        with self.assertRaises(CursorExpiredError):
+            self.feed.read(0)
+
+
+if __name__ == "__main__":
+    unittest.main()